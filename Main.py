@@ -7,17 +7,27 @@ import json
 import re
 import random
 import html
-import traceback
-from typing import Final
+import tempfile
+from typing import Final, Optional
 import uuid
 from pathlib import Path
 import asyncio
-from functools import wraps
+import atexit
+import heapq
+from collections import defaultdict
+from functools import wraps, lru_cache
+from dataclasses import dataclass
 from telegram import Update, User, InlineKeyboardButton, InlineKeyboardMarkup, Message, InputMediaPhoto, InputMediaVideo
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes, CallbackContext, CallbackQueryHandler, ConversationHandler, JobQueue
-from telegram.constants import ChatMemberStatus
+from telegram.constants import ChatMemberStatus, ParseMode
+from telegram.error import BadRequest, Forbidden
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Listed in requirements.txt; the stdlib json fallback keeps older installs working
+except ImportError:
+    orjson = None
+
 # Get the absolute path of the directory where the script is located
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -37,8 +47,9 @@ FILE_LOCKS = {
 # =========================
 # Logging Configuration
 # =========================
+# INFO by default; set LOG_LEVEL=DEBUG in the environment for verbose output
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler(BASE_DIR / "bot.log", encoding='utf-8'),
@@ -63,65 +74,203 @@ BOT_USERNAME: Final = '@MasterBeanoBot'  # Bot's username (update if needed)
 
 # File paths for persistent data storage
 HASHTAG_DATA_FILE = BASE_DIR / 'hashtag_data.json'
+# Append-only log of hashtag entries saved since hashtag_data.json was last written
+HASHTAG_LOG_FILE = BASE_DIR / 'hashtag_data.log'
 ADMIN_DATA_FILE = BASE_DIR / 'admins.json'
 TIMER_SETTINGS_FILE = BASE_DIR / 'timer_settings.json'
 NO_DELETE_IDS_FILE = BASE_DIR / 'no_delete_ids.json'
 OWNER_ID = 7237569475  # Your Telegram ID (change to your actual Telegram user ID)
 
+# In-memory snapshots of JSON data files, keyed by file path.
+# Cached loaders keep {path: (st_mtime_ns, data)} and only re-parse a file when its
+# mtime changes (e.g. it was edited by hand); the matching save_* function refreshes
+# the snapshot and its mtime whenever it writes the file.
+# Memoized views derived from a file (indexes, lru_cache memos) are cleared by its reader
+# and saver, so their wrappers call the load_* function first: that stat revalidates the
+# snapshot and drops the memos if the file changed on disk.
+_DATA_CACHE = {}
+
+def _file_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def _load_cached(path, reader):
+    """Return the cached contents of `path`, calling `reader()` to load it if the file changed."""
+    mtime = _file_mtime(path)
+    cached = _DATA_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    data = reader()
+    _DATA_CACHE[path] = (mtime, data)
+    return data
+
+def _store_cached(path, data):
+    """Record `data` as the cached contents of `path` after it has been saved."""
+    _DATA_CACHE[path] = (_file_mtime(path), data)
+
+def _json_dumps(data, indent=2) -> bytes:
+    """Serialize `data` to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS writes int keys as strings, like the stdlib does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode('utf-8')
+
+def _json_loads(raw):
+    """Parse JSON from bytes or str, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _write_json_atomic(path, data, indent=2):
+    """
+    Write `data` as JSON to a temporary file, then atomically swap it into place at `path`.
+    The JSON is serialized up front and written in one call; pass indent=None for
+    machine-only files where pretty-printing just adds bytes.
+    """
+    _write_bytes_atomic(path, _json_dumps(data, indent))
+
+def _write_bytes_atomic(path, payload: bytes, fsync: bool = False):
+    """
+    Write already-serialized `payload` to a temporary file and atomically swap it into place.
+    Touches no shared data, so it is safe to run in a worker thread.
+    """
+    temp_file_path = _write_temp_file(path, payload, fsync)
+    try:
+        os.replace(temp_file_path, path)
+    except BaseException:
+        _discard_temp_file(temp_file_path)
+        raise
+
+def _write_temp_file(path, payload: bytes, fsync: bool = False) -> str:
+    """
+    Write `payload` to a new temporary file next to `path` and return its path.
+    With fsync=True the data is flushed to disk first, so a crash right after the swap
+    can't leave an empty file in place of the old one.
+    """
+    # A unique temp file in the same directory, so concurrent saves never share one
+    # and os.replace stays a same-filesystem rename.
+    fd, temp_file_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        _discard_temp_file(temp_file_path)
+        raise
+    return temp_file_path
+
+def _discard_temp_file(temp_file_path):
+    # Don't leave stray temp files behind when the write fails
+    try:
+        os.unlink(temp_file_path)
+    except OSError:
+        pass
+
+async def _flush_snapshot(path, payload: bytes, fsync: bool = False):
+    """
+    Write already-serialized `payload` to a temp file in a worker thread, then swap it into
+    place at `path` back on the event loop. Callers update the cache for `path` right after
+    this returns, with no await in between, so no handler can see the new file before the
+    cache does (and re-read it into a dict the caller then replaces).
+    """
+    temp_file_path = await asyncio.to_thread(_write_temp_file, path, payload, fsync)
+    try:
+        os.replace(temp_file_path, path)
+    except BaseException:
+        _discard_temp_file(temp_file_path)
+        raise
+
+def _read_chat_keyed_json(path):
+    """Read a {chat_id: value} JSON file, converting the chat id keys to ints once."""
+    try:
+        with open(path, 'rb') as f:
+            return {int(chat_id): value for chat_id, value in _json_loads(f.read()).items()}
+    except FileNotFoundError:
+        return {}
+
 def load_timer_settings():
-    if os.path.exists(TIMER_SETTINGS_FILE):
-        with open(TIMER_SETTINGS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    return _load_cached(TIMER_SETTINGS_FILE, lambda: _read_chat_keyed_json(TIMER_SETTINGS_FILE))
 
 def save_timer_settings(data):
-    with open(TIMER_SETTINGS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(TIMER_SETTINGS_FILE, data)
+    _store_cached(TIMER_SETTINGS_FILE, data)
 
 def load_no_delete_ids():
-    if os.path.exists(NO_DELETE_IDS_FILE):
-        with open(NO_DELETE_IDS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return []
+    try:
+        with open(NO_DELETE_IDS_FILE, 'rb') as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return []
 
 def save_no_delete_ids(data):
-    with open(NO_DELETE_IDS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(NO_DELETE_IDS_FILE, data)
 
 
+async def _reply(update: Update, text: str, **kwargs) -> Message:
+    """Sends `text` to the chat the update came from; extra kwargs go to send_message."""
+    return await update.effective_chat.send_message(text=text, **kwargs)
+
 # =========================
 # Decorators
 # =========================
+_GROUP_CHAT_TYPES = ('group', 'supergroup')
+_ADMIN_STATUSES = (ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER)
+
+async def _prepare_group_command(update: Update, context: ContextTypes.DEFAULT_TYPE, command_name: str) -> bool:
+    """
+    Deletes a command message sent in a group and reports whether the command may run there.
+    """
+    chat = update.effective_chat
+    message_id = update.message.message_id
+
+    # Immediately delete the command message in groups
+    try:
+        await context.bot.delete_message(chat.id, message_id)
+    except Exception:
+        logger.warning(f"Failed to delete command message {message_id} in chat {chat.id}. Bot may not have delete permissions.")
+
+    # Check if the command is disabled
+    if is_command_disabled(chat.id, command_name):
+        logger.info(f"Command '{command_name}' is disabled in group {chat.id}. Aborting.")
+        return False # Silently abort if command is disabled
+    return True
+
 def command_handler_wrapper(admin_only=False):
     def decorator(func):
+        command_name = func.__name__.replace('_command', '')
+
         @wraps(func)
-        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+        async def wrapper_any(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
             # Do not process if the message is not from a user
             if not update.effective_user or not update.message:
                 return
 
-            user = update.effective_user
-            chat = update.effective_chat
-            message_id = update.message.message_id
+            if update.effective_chat.type in _GROUP_CHAT_TYPES:
+                if not await _prepare_group_command(update, context, command_name):
+                    return
 
-            # Immediately delete the command message in groups
-            if chat.type in ['group', 'supergroup']:
-                try:
-                    await context.bot.delete_message(chat.id, message_id)
-                except Exception:
-                    logger.warning(f"Failed to delete command message {message_id} in chat {chat.id}. Bot may not have delete permissions.")
+            # Execute the actual command function
+            await func(update, context, *args, **kwargs)
+
+        @wraps(func)
+        async def wrapper_admin(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+            # Do not process if the message is not from a user
+            if not update.effective_user or not update.message:
+                return
 
-            # Check if the command is disabled
-            if chat.type in ['group', 'supergroup']:
-                command_name = func.__name__.replace('_command', '')
-                disabled_cmds = set(load_disabled_commands().get(str(chat.id), []))
-                if command_name in disabled_cmds:
-                    logger.info(f"Command '{command_name}' is disabled in group {chat.id}. Aborting.")
-                    return # Silently abort if command is disabled
+            user = update.effective_user
+            chat = update.effective_chat
+            if chat.type in _GROUP_CHAT_TYPES:
+                if not await _prepare_group_command(update, context, command_name):
+                    return
 
-            if admin_only and chat.type in ['group', 'supergroup']:
                 member = await context.bot.get_chat_member(chat.id, user.id)
-                if member.status not in [ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]:
+                if member.status not in _ADMIN_STATUSES:
                     sent_message = await context.bot.send_message(
                         chat_id=chat.id,
                         text=f"Warning: {user.mention_html()}, you are not authorized to use this command.",
@@ -134,7 +283,8 @@ def command_handler_wrapper(admin_only=False):
             # Execute the actual command function
             await func(update, context, *args, **kwargs)
 
-        return wrapper
+        # Pick the specialized wrapper once, at decoration time
+        return wrapper_admin if admin_only else wrapper_any
     return decorator
 
 
@@ -147,66 +297,149 @@ CONDITIONS_DATA_FILE = BASE_DIR / 'conditions.json'
 RANDOM_RISK_SETTINGS_FILE = BASE_DIR / 'random_risk_settings.json'
 
 def load_random_risk_settings():
-    if os.path.exists(RANDOM_RISK_SETTINGS_FILE):
-        with open(RANDOM_RISK_SETTINGS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    return _load_cached(RANDOM_RISK_SETTINGS_FILE, lambda: _read_chat_keyed_json(RANDOM_RISK_SETTINGS_FILE))
 
 def save_random_risk_settings(data):
-    with open(RANDOM_RISK_SETTINGS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(RANDOM_RISK_SETTINGS_FILE, data)
+    _store_cached(RANDOM_RISK_SETTINGS_FILE, data)
 
 def load_risk_data():
-    if os.path.exists(RISK_DATA_FILE):
+    return _load_cached(RISK_DATA_FILE, _read_risk_data)
+
+def _read_risk_data():
+    # The risk indexes are derived from this data, so drop them on every (re)load
+    _clear_risk_indexes()
+    try:
+        with open(RISK_DATA_FILE, 'rb') as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        # Corrupted file detected
+        corrupted_file_path = RISK_DATA_FILE.with_suffix('.json.corrupted')
         try:
-            with open(RISK_DATA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
-            # Corrupted file detected
-            corrupted_file_path = RISK_DATA_FILE.with_suffix('.json.corrupted')
-            try:
-                os.rename(RISK_DATA_FILE, corrupted_file_path)
-                logger.error(f"Risk data file was corrupted. Moved to {corrupted_file_path}. Starting with empty risk data.")
-            except OSError as e:
-                logger.error(f"Could not rename corrupted risk data file: {e}")
-            return {}
-    return {}
+            os.rename(RISK_DATA_FILE, corrupted_file_path)
+            logger.error(f"Risk data file was corrupted. Moved to {corrupted_file_path}. Starting with empty risk data.")
+        except OSError as e:
+            logger.error(f"Could not rename corrupted risk data file: {e}")
+        return {}
+
+# Risk saves only update the in-memory data; flush_risk_data_job writes it out every
+# RISK_FLUSH_INTERVAL seconds, so a burst of risk updates costs a single file write.
+RISK_FLUSH_INTERVAL = 2  # seconds
+_risk_dirty = False
 
 def save_risk_data(data):
-    # Create a temporary file path
-    temp_file_path = RISK_DATA_FILE.with_suffix('.json.tmp')
+    """Make `data` the current risk data. It reaches risk_data.json on the next flush."""
+    global _risk_dirty
+    # Keep the file's mtime so load_risk_data keeps serving `data` until the flush
+    _DATA_CACHE[RISK_DATA_FILE] = (_file_mtime(RISK_DATA_FILE), data)
+    _risk_dirty = True
+    _clear_risk_indexes()
+
+def _clear_risk_indexes():
+    _risk_username_index.cache_clear()
+    _risk_id_index.cache_clear()
+
+def get_risk(user_id, risk_id: str):
+    """Returns the stored risk dict with `risk_id` belonging to `user_id`, or None."""
+    load_risk_data()
+    return _risk_id_index().get((str(user_id), risk_id))
+
+@lru_cache(maxsize=1)
+def _risk_id_index():
+    # {(user id, risk id): risk}; the values are the stored dicts, so updating one updates the data
+    return {
+        (user_id_str, risk['risk_id']): risk
+        for user_id_str, risks in load_risk_data().items()
+        for risk in risks
+    }
+
+def find_risk_user_id(username: str):
+    """Returns the user id (a string) whose risks were saved under `username`, or None."""
+    load_risk_data()
+    return _risk_username_index().get(username.lower())
+
+@lru_cache(maxsize=1)
+def _risk_username_index():
+    # {lowercased username: user id}; the first user found for a username wins, as the old scan did
+    index = {}
+    for user_id_str, risks in load_risk_data().items():
+        for risk in risks:
+            username = risk.get('username')
+            if username:
+                index.setdefault(username.lower(), user_id_str)
+    return index
+
+def flush_risk_data():
+    """Write pending risk data to risk_data.json. Used at shutdown."""
+    global _risk_dirty
+    if not _risk_dirty:
+        return
+    data = load_risk_data()
     try:
-        with open(temp_file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        # Atomically replace the original file with the temporary file
-        os.replace(temp_file_path, RISK_DATA_FILE)
+        _write_bytes_atomic(RISK_DATA_FILE, _json_dumps(data), fsync=True)
     except (OSError, IOError) as e:
         logger.error(f"Could not save risk data to {RISK_DATA_FILE}: {e}")
+        return
+    _store_cached(RISK_DATA_FILE, data)
+    _risk_dirty = False
+
+async def flush_risk_data_job(context: ContextTypes.DEFAULT_TYPE):
+    """Periodic write-behind of risk data, serialized on the loop and written via _flush_snapshot."""
+    global _risk_dirty
+    if not _risk_dirty:
+        return
+    async with FILE_LOCKS["risk"]:
+        payload = _json_dumps(load_risk_data())
+        _risk_dirty = False
+        try:
+            await _flush_snapshot(RISK_DATA_FILE, payload, fsync=True)
+        except (OSError, IOError) as e:
+            _risk_dirty = True
+            logger.error(f"Could not save risk data to {RISK_DATA_FILE}: {e}")
+            return
+        # Saves made during the write stay dirty and go out with the next flush
+        _store_cached(RISK_DATA_FILE, _DATA_CACHE[RISK_DATA_FILE][1])
+
+# Don't lose risk updates made since the last flush on a clean shutdown
+atexit.register(flush_risk_data)
 
 def load_conditions_data():
-    if os.path.exists(CONDITIONS_DATA_FILE):
-        with open(CONDITIONS_DATA_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    return _load_cached(CONDITIONS_DATA_FILE, _read_conditions_data)
+
+def _read_conditions_data():
+    try:
+        with open(CONDITIONS_DATA_FILE, 'rb') as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return {}
 
 def save_conditions_data(data):
-    with open(CONDITIONS_DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(CONDITIONS_DATA_FILE, data)
+    _store_cached(CONDITIONS_DATA_FILE, data)
 
 def load_admin_nicknames():
-    if os.path.exists(ADMIN_NICKNAMES_FILE):
-        with open(ADMIN_NICKNAMES_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    return _load_cached(ADMIN_NICKNAMES_FILE, _read_admin_nicknames)
+
+def _read_admin_nicknames():
+    # get_display_name memoizes names derived from this data, so drop them on every (re)load
+    _display_name_memo.cache_clear()
+    try:
+        with open(ADMIN_NICKNAMES_FILE, 'rb') as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return {}
 
 def save_admin_nicknames(data):
-    with open(ADMIN_NICKNAMES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(ADMIN_NICKNAMES_FILE, data)
+    _store_cached(ADMIN_NICKNAMES_FILE, data)
+    _display_name_memo.cache_clear()
 
 @command_handler_wrapper(admin_only=True)
 async def setnickname_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_owner(update.effective_user.id):
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Only the owner can use this command.")
+        sent_message = await _reply(update, text="Only the owner can use this command.")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -216,14 +449,14 @@ async def setnickname_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     reply_message = update.message.reply_to_message
     if reply_message:
         if not context.args:
-            sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Usage: Reply to a message with `/setnickname <nickname>`")
+            sent_message = await _reply(update, text="Usage: Reply to a message with `/setnickname <nickname>`")
             await schedule_message_deletion(context, sent_message)
             return
         target_id = reply_message.from_user.id
         nickname = " ".join(context.args)
     else:
         if len(context.args) < 2 or not context.args[0].isdigit():
-            sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Usage: `/setnickname <user_id> <nickname>` or reply to a user's message.")
+            sent_message = await _reply(update, text="Usage: `/setnickname <user_id> <nickname>` or reply to a user's message.")
             await schedule_message_deletion(context, sent_message)
             return
 
@@ -232,7 +465,7 @@ async def setnickname_command(update: Update, context: ContextTypes.DEFAULT_TYPE
 
     if not target_id:
         # This case is unlikely to be reached now but serves as a safeguard.
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not identify the target user.")
+        sent_message = await _reply(update, text="Could not identify the target user.")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -240,22 +473,18 @@ async def setnickname_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     nicknames[str(target_id)] = nickname
     save_admin_nicknames(nicknames)
 
-    target_user_info = f"user with ID {target_id}"
-    try:
-        if update.effective_chat.type != 'private':
-            member = await context.bot.get_chat_member(update.effective_chat.id, target_id)
-            target_user_info = member.user.mention_html()
-    except Exception:
-        # Fallback to user ID if we can't get chat member info
-        pass
+    if reply_message:
+        target_user_info = reply_message.from_user.mention_html()
+    else:
+        target_user_info = await get_member_mention(context.bot, update.effective_chat, target_id)
 
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Nickname for {target_user_info} has been set to '{nickname}'.", parse_mode='HTML')
+    sent_message = await _reply(update, text=f"Nickname for {target_user_info} has been set to '{nickname}'.", parse_mode='HTML')
     await schedule_message_deletion(context, sent_message)
 
 @command_handler_wrapper(admin_only=True)
 async def removenickname_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_owner(update.effective_user.id):
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Only the owner can use this command.")
+        sent_message = await _reply(update, text="Only the owner can use this command.")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -266,14 +495,14 @@ async def removenickname_command(update: Update, context: ContextTypes.DEFAULT_T
         target_id = reply_message.from_user.id
     else:
         if not context.args or not context.args[0].isdigit():
-            sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Usage: Reply to a user with /removenickname, or use `/removenickname <user_id>`.")
+            sent_message = await _reply(update, text="Usage: Reply to a user with /removenickname, or use `/removenickname <user_id>`.")
             await schedule_message_deletion(context, sent_message)
             return
         target_id = int(context.args[0])
 
     if not target_id:
         # This case is unlikely to be reached now but serves as a safeguard.
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not identify the target user.")
+        sent_message = await _reply(update, text="Could not identify the target user.")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -282,19 +511,15 @@ async def removenickname_command(update: Update, context: ContextTypes.DEFAULT_T
         del nicknames[str(target_id)]
         save_admin_nicknames(nicknames)
 
-        target_user_info = f"user with ID {target_id}"
-        try:
-            if update.effective_chat.type != 'private':
-                member = await context.bot.get_chat_member(update.effective_chat.id, target_id)
-                target_user_info = member.user.mention_html()
-        except Exception:
-            # Fallback to user ID if we can't get chat member info
-            pass
+        if reply_message:
+            target_user_info = reply_message.from_user.mention_html()
+        else:
+            target_user_info = await get_member_mention(context.bot, update.effective_chat, target_id)
 
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Nickname for {target_user_info} has been removed.", parse_mode='HTML')
+        sent_message = await _reply(update, text=f"Nickname for {target_user_info} has been removed.", parse_mode='HTML')
         await schedule_message_deletion(context, sent_message)
     else:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="This user does not have a nickname set.")
+        sent_message = await _reply(update, text="This user does not have a nickname set.")
         await schedule_message_deletion(context, sent_message)
 
 
@@ -331,57 +556,53 @@ async def allban_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 target_user_id = int(found_user_id)
                 target_user_info = f"user @{username_to_find}"
             else:
-                sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Could not find a user ID for {arg}. This can happen if I haven't interacted with them before. Please use their user ID or reply to one of their messages.")
+                sent_message = await _reply(update, text=f"Could not find a user ID for {arg}. This can happen if I haven't interacted with them before. Please use their user ID or reply to one of their messages.")
                 await schedule_message_deletion(context, sent_message)
                 return
         else:
-            sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Invalid argument. Please provide a user ID, a @username, or reply to a user's message.")
+            sent_message = await _reply(update, text="Invalid argument. Please provide a user ID, a @username, or reply to a user's message.")
             await schedule_message_deletion(context, sent_message)
             return
     else:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Usage: /allban <user_id or @username> or reply to a user's message.")
+        sent_message = await _reply(update, text="Usage: /allban <user_id or @username> or reply to a user's message.")
         await schedule_message_deletion(context, sent_message)
         return
 
     if not target_user_id:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Could not identify the target user.")
+        sent_message = await _reply(update, text="Could not identify the target user.")
         await schedule_message_deletion(context, sent_message)
         return
 
     if is_owner(target_user_id):
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="You cannot ban the owner.")
+        sent_message = await _reply(update, text="You cannot ban the owner.")
         await schedule_message_deletion(context, sent_message)
         return
     if target_user_id == update.effective_user.id:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="You cannot ban yourself.")
+        sent_message = await _reply(update, text="You cannot ban yourself.")
         await schedule_message_deletion(context, sent_message)
         return
 
-    admin_data = load_admin_data()
-    all_group_ids = {group for groups in admin_data.values() for group in groups}
-    disabled_cmds = load_disabled_commands()
+    all_group_ids = get_all_group_ids()
 
     successful_bans = []
     failed_bans = []
 
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Processing all-ban for {target_user_info}. This may take a moment...", parse_mode='HTML')
+    sent_message = await _reply(update, text=f"Processing all-ban for {target_user_info}. This may take a moment...", parse_mode='HTML')
     await schedule_message_deletion(context, sent_message)
 
     for group_id in all_group_ids:
-        if 'allban' in disabled_cmds.get(str(group_id), []):
+        if is_command_disabled(int(group_id), 'allban'):
             continue
 
         try:
             await context.bot.ban_chat_member(chat_id=int(group_id), user_id=target_user_id)
             try:
-                chat = await context.bot.get_chat(int(group_id))
-                successful_bans.append(html.escape(chat.title))
+                successful_bans.append(html.escape(await get_chat_title(context.bot, group_id)))
             except Exception:
                 successful_bans.append(f"Group ID {group_id}")
         except Exception as e:
             try:
-                chat = await context.bot.get_chat(int(group_id))
-                failed_bans.append(f"{html.escape(chat.title)} (Reason: {e})")
+                failed_bans.append(f"{html.escape(await get_chat_title(context.bot, group_id))} (Reason: {e})")
             except Exception:
                 failed_bans.append(f"Group ID {group_id} (Reason: {e})")
 
@@ -393,7 +614,7 @@ async def allban_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not successful_bans and not failed_bans:
         summary_message = f"Could not perform the ban. Either the bot is not in any groups or the `/allban` command is disabled in all of them."
 
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=summary_message, parse_mode='HTML')
+    sent_message = await _reply(update, text=summary_message, parse_mode='HTML')
     await schedule_message_deletion(context, sent_message)
 
 
@@ -412,33 +633,33 @@ async def random_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # Group functionality: Set percentage
     if chat.type in ['group', 'supergroup']:
         member = await context.bot.get_chat_member(chat.id, user.id)
-        if member.status not in [ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]:
-            await context.bot.send_message(chat.id, "This command is for admins in a group. To add media to the random pool, please use /random in a private chat with me.")
+        if member.status not in _ADMIN_STATUSES:
+            await _reply(update, text="This command is for admins in a group. To add media to the random pool, please use /random in a private chat with me.")
             return ConversationHandler.END
 
         if not context.args:
             settings = load_random_risk_settings()
-            current_percentage = settings.get(str(chat.id), 0)
-            await context.bot.send_message(chat.id, f"The current random risk chance is {current_percentage}%. Use `/random <percentage>` to change it.")
+            current_percentage = settings.get(chat.id, 0)
+            await _reply(update, text=f"The current random risk chance is {current_percentage}%. Use `/random <percentage>` to change it.")
             return ConversationHandler.END
 
         try:
             percentage = float(context.args[0])
             if not (0 <= percentage <= 100):
-                await context.bot.send_message(chat.id, "Percentage must be between 0 and 100.")
+                await _reply(update, text="Percentage must be between 0 and 100.")
                 return ConversationHandler.END
 
             settings = load_random_risk_settings()
             if percentage == 0:
-                settings.pop(str(chat.id), None)
-                await context.bot.send_message(chat.id, "Automatic random risk posting has been disabled for this group.")
+                settings.pop(chat.id, None)
+                await _reply(update, text="Automatic random risk posting has been disabled for this group.")
             else:
-                settings[str(chat.id)] = percentage
-                await context.bot.send_message(chat.id, f"Automatic random risk chance set to {percentage}%.")
+                settings[chat.id] = percentage
+                await _reply(update, text=f"Automatic random risk chance set to {percentage}%.")
             save_random_risk_settings(settings)
 
         except ValueError:
-            await context.bot.send_message(chat.id, "Invalid percentage. Please provide a number.")
+            await _reply(update, text="Invalid percentage. Please provide a number.")
 
         return ConversationHandler.END
 
@@ -500,12 +721,7 @@ async def random_receive_media_handler(update: Update, context: ContextTypes.DEF
         context.user_data['random_media'] = []
 
     media_list = context.user_data['random_media']
-    media_type, file_id = None, None
-
-    if message.photo: media_type, file_id = "photo", message.photo[-1].file_id
-    elif message.video: media_type, file_id = "video", message.video.file_id
-    elif message.voice: media_type, file_id = "voice", message.voice.file_id
-
+    media_type, file_id = extract_media(message)
     if not media_type:
         await message.reply_text("That's not a valid media type. Please send a photo, video, or voice note.")
         return AWAIT_RANDOM_MEDIA
@@ -530,7 +746,7 @@ async def random_save_media_callback(update: Update, context: ContextTypes.DEFAU
 
     media_list = context.user_data.get('random_media', [])
     if not media_list:
-        await context.bot.send_message(update.effective_chat.id, "No media was sent. Operation cancelled.")
+        await _reply(update, text="No media was sent. Operation cancelled.")
         return ConversationHandler.END
 
     target_user_id = context.user_data.get('random_target_user_id')
@@ -549,10 +765,9 @@ async def random_save_media_callback(update: Update, context: ContextTypes.DEFAU
 
     # These risks are added to the general pool, so they need a group. We'll pick one randomly.
     # This is a limitation - the user didn't specify a group. We'll pick any available group.
-    admin_data = load_admin_data()
-    all_group_ids = [group for groups in admin_data.values() for group in groups]
+    all_group_ids = tuple(get_all_group_ids())
     if not all_group_ids:
-        await context.bot.send_message(update.effective_chat.id, "Error: There are no groups configured for the bot. Cannot save media.")
+        await _reply(update, text="Error: There are no groups configured for the bot. Cannot save media.")
         return ConversationHandler.END
 
     for media_item in media_list:
@@ -567,7 +782,7 @@ async def random_save_media_callback(update: Update, context: ContextTypes.DEFAU
         risk_data.setdefault(str(target_user_id), []).append(new_risk)
 
     save_risk_data(risk_data)
-    await context.bot.send_message(update.effective_chat.id, f"Success! {len(media_list)} media item(s) have been added to the random pool for user {target_user_id}.")
+    await _reply(update, text=f"Success! {len(media_list)} media item(s) have been added to the random pool for user {target_user_id}.")
 
     # Clean up context
     for key in ['random_target_user_id', 'random_media']:
@@ -580,12 +795,12 @@ async def random_save_media_callback(update: Update, context: ContextTypes.DEFAU
 async def addcondition_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat = update.effective_chat
     if chat.type not in ['group', 'supergroup']:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="This command can only be used in a group chat.")
+        sent_message = await _reply(update, text="This command can only be used in a group chat.")
         await schedule_message_deletion(context, sent_message)
         return
 
     if not context.args:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="Usage: /addcondition <text of the condition>")
+        sent_message = await _reply(update, text="Usage: /addcondition <text of the condition>")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -608,14 +823,14 @@ async def addcondition_command(update: Update, context: ContextTypes.DEFAULT_TYP
     conditions_data[group_id] = group_conditions
     save_conditions_data(conditions_data)
 
-    sent_message = await context.bot.send_message(chat_id=chat.id, text=f"✅ Condition added with ID: `{new_condition['id']}` for this group.", parse_mode='HTML')
+    sent_message = await _reply(update, text=f"✅ Condition added with ID: `{new_condition['id']}` for this group.", parse_mode='HTML')
     await schedule_message_deletion(context, sent_message)
 
 @command_handler_wrapper(admin_only=True)
 async def listconditions_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat = update.effective_chat
     if chat.type not in ['group', 'supergroup']:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="This command can only be used in a group chat.")
+        sent_message = await _reply(update, text="This command can only be used in a group chat.")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -624,14 +839,14 @@ async def listconditions_command(update: Update, context: ContextTypes.DEFAULT_T
 
     if not isinstance(conditions_data, dict):
         # Handle case where data might be in the old list format or non-existent
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="No conditions have been set for this group.")
+        sent_message = await _reply(update, text="No conditions have been set for this group.")
         await schedule_message_deletion(context, sent_message)
         return
 
     group_conditions = conditions_data.get(group_id, [])
 
     if not group_conditions:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="No conditions have been set for this group.")
+        sent_message = await _reply(update, text="No conditions have been set for this group.")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -639,7 +854,7 @@ async def listconditions_command(update: Update, context: ContextTypes.DEFAULT_T
     for cond in group_conditions:
         message += f"- <b>ID: {cond['id']}</b>\n  <i>{html.escape(cond['text'])}</i>\n\n"
 
-    sent_message = await context.bot.send_message(chat_id=chat.id, text=message, parse_mode='HTML')
+    sent_message = await _reply(update, text=message, parse_mode='HTML')
     await schedule_message_deletion(context, sent_message)
 
 
@@ -647,12 +862,12 @@ async def listconditions_command(update: Update, context: ContextTypes.DEFAULT_T
 async def removecondition_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat = update.effective_chat
     if chat.type not in ['group', 'supergroup']:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="This command can only be used in a group chat.")
+        sent_message = await _reply(update, text="This command can only be used in a group chat.")
         await schedule_message_deletion(context, sent_message)
         return
 
     if not context.args:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="Usage: /removecondition <condition_id>")
+        sent_message = await _reply(update, text="Usage: /removecondition <condition_id>")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -662,13 +877,13 @@ async def removecondition_command(update: Update, context: ContextTypes.DEFAULT_
 
     if not isinstance(conditions_data, dict):
         # Data is not in the expected format, so there's nothing to remove.
-        sent_message = await context.bot.send_message(chat_id=chat.id, text=f"❌ Could not find a condition with ID `{condition_id_to_remove}` in this group.", parse_mode='HTML')
+        sent_message = await _reply(update, text=f"❌ Could not find a condition with ID `{condition_id_to_remove}` in this group.", parse_mode='HTML')
         await schedule_message_deletion(context, sent_message)
         return
 
     group_conditions = conditions_data.get(group_id, [])
     if not group_conditions:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text=f"❌ Could not find a condition with ID `{condition_id_to_remove}` in this group.", parse_mode='HTML')
+        sent_message = await _reply(update, text=f"❌ Could not find a condition with ID `{condition_id_to_remove}` in this group.", parse_mode='HTML')
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -684,10 +899,10 @@ async def removecondition_command(update: Update, context: ContextTypes.DEFAULT_
             # If no conditions are left, remove the group entry entirely
             del conditions_data[group_id]
         save_conditions_data(conditions_data)
-        sent_message = await context.bot.send_message(chat_id=chat.id, text=f"✅ Condition with ID `{condition_id_to_remove}` has been removed from this group.", parse_mode='HTML')
+        sent_message = await _reply(update, text=f"✅ Condition with ID `{condition_id_to_remove}` has been removed from this group.", parse_mode='HTML')
         await schedule_message_deletion(context, sent_message)
     else:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text=f"❌ Could not find a condition with ID `{condition_id_to_remove}` in this group.", parse_mode='HTML')
+        sent_message = await _reply(update, text=f"❌ Could not find a condition with ID `{condition_id_to_remove}` in this group.", parse_mode='HTML')
         await schedule_message_deletion(context, sent_message)
 
 
@@ -698,7 +913,7 @@ async def update_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     chat = update.effective_chat
     if chat.type not in ['group', 'supergroup']:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="This command can only be used in a group chat.")
+        sent_message = await _reply(update, text="This command can only be used in a group chat.")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -707,36 +922,36 @@ async def update_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # Get current admins from Telegram
     try:
-        current_admins = await context.bot.get_chat_administrators(chat.id)
+        # Always fetch fresh here; this also refreshes the cached admin list
+        current_admins = await get_chat_administrators_cached(context.bot, chat.id, refresh=True)
         current_admin_ids = {str(admin.user.id) for admin in current_admins}
         logger.debug(f"Current admins in group {group_id}: {current_admin_ids}")
     except Exception as e:
         logger.error(f"Failed to get admins for group {group_id}: {e}")
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Error: Could not retrieve the list of administrators for this group.")
+        sent_message = await _reply(update, text="Error: Could not retrieve the list of administrators for this group.")
         await schedule_message_deletion(context, sent_message)
         return
 
     # Load existing admin data
     admin_data = load_admin_data()
 
-    # Find users who were admin in this group but are no longer
-    removed_admins = []
-    for user_id, groups in list(admin_data.items()):  # Use list to allow modification during iteration
-        if group_id in groups and user_id not in current_admin_ids:
-            groups.remove(group_id)
-            removed_admins.append(user_id)
-            logger.info(f"User {user_id} is no longer an admin in group {group_id}.")
+    # Diff the stored admins of this group against Telegram's current list
+    previous_admin_ids = {user_id for user_id, groups in admin_data.items() if group_id in groups}
+    removed_admins = previous_admin_ids - current_admin_ids
+    added_admins = current_admin_ids - previous_admin_ids
+
+    # Remove users who were admin in this group but are no longer
+    for user_id in removed_admins:
+        admin_data[user_id].remove(group_id)
+        logger.info(f"User {user_id} is no longer an admin in group {group_id}.")
 
     # Add new admins
-    added_admins = []
-    for user_id in current_admin_ids:
+    for user_id in added_admins:
         if user_id not in admin_data:
             admin_data[user_id] = [group_id]
-            added_admins.append(user_id)
             logger.info(f"User {user_id} is a new global admin, added from group {group_id}.")
-        elif group_id not in admin_data[user_id]:
+        else:
             admin_data[user_id].append(group_id)
-            added_admins.append(user_id)
             logger.info(f"User {user_id} is now also an admin in group {group_id}.")
 
     # Save the updated data
@@ -752,40 +967,53 @@ async def update_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         message_parts.append("No changes were needed.")
 
     message = "\n".join(message_parts)
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=message)
+    sent_message = await _reply(update, text=message)
     await schedule_message_deletion(context, sent_message)
 
 
 def load_admin_data():
-    """Load admin data from file."""
-    if os.path.exists(ADMIN_DATA_FILE):
-        with open(ADMIN_DATA_FILE, 'r', encoding='utf-8') as f:
-            try:
-                data = json.load(f)
-                if not isinstance(data, dict):
-                    logger.warning("Admin data file is not a dictionary, returning empty.")
-                    return {}
-                return data
-            except json.JSONDecodeError:
-                logger.warning("Failed to decode admin data file, returning empty.")
-                return {}
-    return {}
+    """Load admin data, reading the file only on first use."""
+    return _load_cached(ADMIN_DATA_FILE, _read_admin_data)
+
+def _read_admin_data():
+    """Read admin data from file."""
+    # Several helpers memoize answers derived from this data, so drop them on every (re)load
+    _clear_admin_memos()
+    try:
+        with open(ADMIN_DATA_FILE, 'rb') as f:
+            data = _json_loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError:
+        logger.warning("Failed to decode admin data file, returning empty.")
+        return {}
+    if not isinstance(data, dict):
+        logger.warning("Admin data file is not a dictionary, returning empty.")
+        return {}
+    return data
 
 def save_admin_data(data):
     """Save admin data to file."""
-    with open(ADMIN_DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(ADMIN_DATA_FILE, data)
+    _store_cached(ADMIN_DATA_FILE, data)
+    _clear_admin_memos()
     logger.debug(f"Saved admin data: {data}")
 
 def is_owner(user_id):
     """Check if the user is the owner."""
-    return str(user_id) == str(OWNER_ID)
+    return int(user_id) == OWNER_ID
 
 def get_display_name(user_id: int, full_name: str) -> str:
     """
     Determines the display name for a user.
     It prioritizes nicknames, then falls back to the user's full name.
+    Results are memoized; reloading or saving nicknames clears the memo.
     """
+    load_admin_nicknames()
+    return _display_name_memo(user_id, full_name)
+
+@lru_cache(maxsize=4096)
+def _display_name_memo(user_id: int, full_name: str) -> str:
     nicknames = load_admin_nicknames()
     name = nicknames.get(str(user_id))
     if name:
@@ -802,7 +1030,15 @@ def get_capitalized_name(user_id: int, full_name: str) -> str:
     return name.capitalize()
 
 def is_admin(user_id):
-    """Check if the user is the owner or an admin in any group."""
+    """
+    Check if the user is the owner or an admin in any group.
+    Results are memoized; reloading or saving admin data clears the memo.
+    """
+    load_admin_data()
+    return _is_admin_memo(user_id)
+
+@lru_cache(maxsize=4096)
+def _is_admin_memo(user_id):
     if is_owner(user_id):
         return True
     data = load_admin_data()
@@ -812,20 +1048,133 @@ def is_admin(user_id):
     logger.debug(f"is_admin({user_id}) -> {is_admin_result}")
     return is_admin_result
 
+def get_all_group_ids() -> frozenset:
+    """
+    Returns the ids (strings, as stored) of every group that has a known admin.
+    The result is memoized; reloading or saving admin data clears the memo.
+    """
+    load_admin_data()
+    return _all_group_ids_memo()
+
+@lru_cache(maxsize=1)
+def _all_group_ids_memo() -> frozenset:
+    return frozenset(group for groups in load_admin_data().values() for group in groups)
+
+def get_admin_ids_for_groups(group_ids) -> set:
+    """
+    Returns the ids (ints) of the known admins of any of `group_ids`, from admins.json.
+    Backed by a memoized group -> admins index that is rebuilt when admin data changes.
+    """
+    load_admin_data()
+    index = _group_admins_index()
+    return set().union(*(index.get(group_id, ()) for group_id in group_ids))
+
+@lru_cache(maxsize=1)
+def _group_admins_index() -> dict:
+    index = {}
+    for admin_id, groups in load_admin_data().items():
+        for group_id in groups:
+            index.setdefault(group_id, set()).add(int(admin_id))
+    return index
+
+def _clear_admin_memos():
+    _is_admin_memo.cache_clear()
+    _all_group_ids_memo.cache_clear()
+    _group_admins_index.cache_clear()
+
+# {chat_id: (fetched_at, admins, admin_ids)} for get_chat_administrators results
+_CHAT_ADMINS_CACHE = {}
+CHAT_ADMINS_CACHE_TTL = 300  # seconds
+
+async def _get_chat_admins_entry(bot, chat_id: int, refresh: bool = False):
+    entry = _CHAT_ADMINS_CACHE.get(chat_id)
+    if refresh or entry is None or time.monotonic() - entry[0] >= CHAT_ADMINS_CACHE_TTL:
+        admins = await bot.get_chat_administrators(chat_id)
+        entry = (time.monotonic(), admins, frozenset(admin.user.id for admin in admins))
+        _CHAT_ADMINS_CACHE[chat_id] = entry
+    return entry
+
+async def get_chat_administrators_cached(bot, chat_id: int, refresh: bool = False):
+    """
+    Returns a group's administrators, calling the Telegram API at most once per
+    CHAT_ADMINS_CACHE_TTL seconds per chat. Pass refresh=True to force a fetch.
+    """
+    return (await _get_chat_admins_entry(bot, chat_id, refresh))[1]
+
+async def get_group_admin_ids(bot, chat_id: int) -> frozenset:
+    """
+    Returns the user ids of a group's current administrators as a frozenset of ints.
+    """
+    return (await _get_chat_admins_entry(bot, chat_id))[2]
+
+async def is_chat_admin(bot, chat_id: int, user_id: int) -> bool:
+    """
+    Checks whether a user is an administrator (or the owner) of a group using the cached
+    admin list, so it can be up to CHAT_ADMINS_CACHE_TTL seconds stale. Permission checks
+    that guard changes should keep asking get_chat_member directly.
+    """
+    return user_id in await get_group_admin_ids(bot, chat_id)
+
+async def get_member_mention(bot, chat, user_id: int) -> str:
+    """
+    Returns an HTML mention of a user in a group, falling back to their id. Admins are
+    found in the cached admin list; anyone else costs one get_chat_member call.
+    """
+    if chat.type != 'private':
+        try:
+            for admin in await get_chat_administrators_cached(bot, chat.id):
+                if admin.user.id == user_id:
+                    return admin.user.mention_html()
+            member = await bot.get_chat_member(chat.id, user_id)
+            return member.user.mention_html()
+        except Exception:
+            pass  # Fall back to the user ID if we can't get chat member info
+    return f"user with ID {user_id}"
+
+# {chat_id: (fetched_at, title)} for get_chat results
+_CHAT_TITLE_CACHE = {}
+CHAT_TITLE_CACHE_TTL = 300  # seconds
+# {chat_id: (failed_at, error)} for chats Telegram says are gone or closed to the bot
+_CHAT_TITLE_FAILURES = {}
+CHAT_TITLE_FAILURE_TTL = 60  # seconds
+
+async def get_chat_title(bot, chat_id) -> str:
+    """
+    Returns a group's title, calling get_chat at most once per CHAT_TITLE_CACHE_TTL
+    seconds per chat. Accepts int or str ids; errors propagate to the caller, and
+    BadRequest/Forbidden ones are replayed for CHAT_TITLE_FAILURE_TTL seconds.
+    """
+    chat_id = int(chat_id)
+    now = time.monotonic()
+    entry = _CHAT_TITLE_CACHE.get(chat_id)
+    if entry is not None and now - entry[0] < CHAT_TITLE_CACHE_TTL:
+        return entry[1]
+    failure = _CHAT_TITLE_FAILURES.get(chat_id)
+    if failure is not None and now - failure[0] < CHAT_TITLE_FAILURE_TTL:
+        raise failure[1]
+    try:
+        chat = await bot.get_chat(chat_id)
+    except Exception as e:
+        # The chat may have migrated or kicked the bot; don't keep serving its old title
+        _CHAT_TITLE_CACHE.pop(chat_id, None)
+        # "Chat not found" and "bot was kicked" won't change on a retry, so answer those
+        # from memory for a while; timeouts and flood waits are retried on the next call
+        if isinstance(e, (BadRequest, Forbidden)):
+            _CHAT_TITLE_FAILURES[chat_id] = (time.monotonic(), e)
+        raise
+    _CHAT_TITLE_FAILURES.pop(chat_id, None)
+    _CHAT_TITLE_CACHE[chat_id] = (time.monotonic(), chat.title)
+    return chat.title
+
 
 async def _notify_admins_of_failed_post(context: ContextTypes.DEFAULT_TYPE, group_id: str, failed_user_id: int, reason: str):
     """Notifies admins of a specific group that an automatic post has failed."""
     logger.info(f"Notifying admins of group {group_id} about a failed post for user {failed_user_id}.")
 
-    admin_data = load_admin_data()
-    admin_ids = set()
-    for admin_id, groups in admin_data.items():
-        if group_id in groups:
-            admin_ids.add(int(admin_id))
+    admin_ids = get_admin_ids_for_groups((group_id,))
 
     # Also notify the owner
-    if is_owner(OWNER_ID):
-        admin_ids.add(OWNER_ID)
+    admin_ids.add(OWNER_ID)
 
     if not admin_ids:
         logger.warning(f"Could not find any admins for group {group_id} to notify about failed post.")
@@ -838,8 +1187,7 @@ async def _notify_admins_of_failed_post(context: ContextTypes.DEFAULT_TYPE, grou
         failed_user_mention = f"user with ID <code>{failed_user_id}</code>"
 
     try:
-        group_chat = await context.bot.get_chat(int(group_id))
-        group_name = group_chat.title
+        group_name = await get_chat_title(context.bot, group_id)
     except Exception:
         group_name = f"group with ID <code>{group_id}</code>"
 
@@ -861,21 +1209,105 @@ async def _notify_admins_of_failed_post(context: ContextTypes.DEFAULT_TYPE, grou
 # Hashtag Data Management
 # =============================
 def load_hashtag_data():
-    """Load hashtagged message/media data from file."""
-    if os.path.exists(HASHTAG_DATA_FILE):
-        with open(HASHTAG_DATA_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            logger.debug(f"Loaded hashtag data: {list(data.keys())}")
-            return data
-    logger.debug("No hashtag data file found, returning empty dict.")
-    return {}
-
-def save_hashtag_data(data):
-    """Save hashtagged message/media data to file."""
-    with open(HASHTAG_DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    """
+    Load hashtagged message/media data as {tag: {chat_id: [entry, ...]}}, re-reading
+    the file only when it changes. Chat ids are string keys, as stored in JSON.
+    """
+    return _load_cached(HASHTAG_DATA_FILE, _read_hashtag_data)
+
+def _read_hashtag_data():
+    """Read hashtagged message/media data from file."""
+    global _sorted_hashtags
+    _sorted_hashtags = None
+    try:
+        with open(HASHTAG_DATA_FILE, 'rb') as f:
+            data = _json_loads(f.read())
+    except FileNotFoundError:
+        logger.debug("No hashtag data file found, starting from an empty dict.")
+        data = {}
+    # Older files stored {tag: [entry, ...]}; regroup those entries by chat.
+    # The upgraded layout is written back on the next save.
+    for tag, entries in data.items():
+        if isinstance(entries, list):
+            by_chat = {}
+            for entry in entries:
+                by_chat.setdefault(str(entry.get('chat_id')), []).append(entry)
+            data[tag] = by_chat
+    # Replay entries logged since the snapshot. A crash between writing the snapshot and
+    # emptying the log can leave entries in both, so skip message ids already present.
+    try:
+        with open(HASHTAG_LOG_FILE, 'rb') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        lines = []
+    for line in lines:
+        try:
+            record = _json_loads(line)
+        except json.JSONDecodeError:
+            continue  # A torn last line from a crash mid-append
+        bucket = data.setdefault(record['tag'], {}).setdefault(record['chat'], [])
+        entry = record['entry']
+        if not any(saved.get('message_id') == entry.get('message_id') for saved in bucket):
+            bucket.append(entry)
+    logger.debug(f"Loaded hashtag data: {list(data.keys())}")
+    return data
+
+async def save_hashtag_data(data):
+    """
+    Save hashtagged message/media data to file. This is the largest data file, so it is
+    written through _flush_snapshot; the lock keeps overlapping saves from landing out of order.
+    """
+    global _sorted_hashtags
+    async with FILE_LOCKS["hashtags"]:
+        payload = _json_dumps(data)
+        await _flush_snapshot(HASHTAG_DATA_FILE, payload)
+        _store_cached(HASHTAG_DATA_FILE, data)
+        _sorted_hashtags = None
+        # Everything logged so far is now part of the snapshot; appends wait on the lock
+        _truncate_file(HASHTAG_LOG_FILE)
     logger.debug(f"Saved hashtag data: {list(data.keys())}")
 
+# Sorted tag names, reused until a tag is added (the count changes) or the data is
+# reloaded or saved, which covers tags removed by /disable
+_sorted_hashtags = None
+
+def get_sorted_hashtags() -> tuple:
+    """Returns the hashtag command names in sorted order."""
+    global _sorted_hashtags
+    data = load_hashtag_data()
+    if _sorted_hashtags is None or len(_sorted_hashtags) != len(data):
+        _sorted_hashtags = tuple(sorted(data))
+    return _sorted_hashtags
+
+async def append_hashtag_entries(chat_key: str, tags, entry):
+    """
+    Persist a newly saved entry under `tags` by appending one line per tag to the hashtag log,
+    instead of rewriting all of hashtag_data.json. The caller has already added it in memory.
+    """
+    payload = b''.join(_json_dumps({'tag': tag, 'chat': chat_key, 'entry': entry}, indent=None) + b'\n' for tag in tags)
+    async with FILE_LOCKS["hashtags"]:
+        await asyncio.to_thread(_append_bytes, HASHTAG_LOG_FILE, payload)
+
+def _append_bytes(path, payload: bytes):
+    with open(path, 'ab') as f:
+        f.write(payload)
+
+def _truncate_file(path):
+    with open(path, 'wb'):
+        pass
+
+# The hashtag log only grows between snapshots, so it is folded into hashtag_data.json daily
+HASHTAG_COMPACT_INTERVAL = 86400  # seconds
+
+async def compact_hashtag_data_job(context: ContextTypes.DEFAULT_TYPE):
+    """Rewrite hashtag_data.json from memory and empty the hashtag log, if anything was logged."""
+    try:
+        if os.path.getsize(HASHTAG_LOG_FILE) == 0:
+            return
+    except FileNotFoundError:
+        return
+    await save_hashtag_data(load_hashtag_data())
+
 import asyncio
 import time
 
@@ -884,41 +1316,137 @@ import time
 # Inactivity Tracking & Settings
 # =============================
 ACTIVITY_DATA_FILE = BASE_DIR / 'activity.json'
+# Append-only log of activity updates made since activity.json was last written
+ACTIVITY_LOG_FILE = BASE_DIR / 'activity.log'
 INACTIVE_SETTINGS_FILE = BASE_DIR / 'inactive_settings.json'
 
 def load_activity_data():
-    if os.path.exists(ACTIVITY_DATA_FILE):
-        with open(ACTIVITY_DATA_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    return _load_cached(ACTIVITY_DATA_FILE, _read_activity_data)
+
+def _read_activity_data():
+    """
+    Read activity data as {group_id: {user_id: last_active}}, all ints.
+    JSON object keys are always strings, so they are converted once here;
+    json.dump turns them back into strings when saving.
+    Updates logged to activity.log since the last snapshot are replayed on top.
+    """
+    try:
+        with open(ACTIVITY_DATA_FILE, 'rb') as f:
+            raw = _json_loads(f.read())
+    except FileNotFoundError:
+        raw = {}
+    data = {
+        int(group_id): {int(user_id): int(ts) for user_id, ts in members.items()}
+        for group_id, members in raw.items()
+    }
+    try:
+        with open(ACTIVITY_LOG_FILE, 'rb') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        lines = []
+    for line in lines:
+        try:
+            entry = _json_loads(line)
+        except json.JSONDecodeError:
+            continue  # A torn last line from a crash mid-append
+        data.setdefault(entry['g'], {})[entry['u']] = entry['t']
+    return data
 
 def save_activity_data(data):
-    with open(ACTIVITY_DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_json_atomic(ACTIVITY_DATA_FILE, data, indent=None)
+    _store_cached(ACTIVITY_DATA_FILE, data)
 
 def load_inactive_settings():
-    if os.path.exists(INACTIVE_SETTINGS_FILE):
-        with open(INACTIVE_SETTINGS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    return _load_cached(INACTIVE_SETTINGS_FILE, lambda: _read_chat_keyed_json(INACTIVE_SETTINGS_FILE))
 
 def save_inactive_settings(data):
-    with open(INACTIVE_SETTINGS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-def update_user_activity(user_id, group_id):
-    data = load_activity_data()
-    group_id = str(group_id)
-    user_id = str(user_id)
-    if group_id not in data:
-        data[group_id] = {}
-    data[group_id][user_id] = int(time.time())
-    save_activity_data(data)
+    _write_json_atomic(INACTIVE_SETTINGS_FILE, data)
+    _store_cached(INACTIVE_SETTINGS_FILE, data)
+
+# Activity is updated in memory and appended to activity.log (at most once per
+# ACTIVITY_RECORD_INTERVAL per user and group);
+# flush_activity_data periodically compacts it into activity.json and empties the log,
+# instead of rewriting activity.json per message.
+ACTIVITY_FLUSH_INTERVAL = 300  # seconds
+ACTIVITY_RECORD_INTERVAL = 60  # seconds; repeat activity within this window is not re-recorded
+_activity_dirty = False
+_activity_log = None
+
+def _get_activity_log():
+    """Return the line-buffered append handle for activity.log, opening it on first use."""
+    global _activity_log
+    if _activity_log is None:
+        _activity_log = open(ACTIVITY_LOG_FILE, 'a', encoding='utf-8', buffering=1)
+    return _activity_log
+
+def update_user_activity(user, chat):
+    """Record that `user` was just active in `chat`; does nothing outside groups."""
+    global _activity_dirty
+    if user is None or chat is None or chat.type not in _GROUP_CHAT_TYPES:
+        return
+    group_id, user_id, now = chat.id, user.id, int(time.time())
+    group_activity = load_activity_data().setdefault(group_id, {})
+    # Inactivity is measured in days, so a user who was just recorded needs no new log line
+    if now - group_activity.get(user_id, 0) < ACTIVITY_RECORD_INTERVAL:
+        return
+    group_activity[user_id] = now
+    _get_activity_log().write(json.dumps({'g': group_id, 'u': user_id, 't': now}) + '\n')
+    _activity_dirty = True
     logger.debug(f"Updated activity for user {user_id} in group {group_id}")
 
+def flush_activity_data():
+    """Compact the in-memory activity data into activity.json if it changed since the last flush."""
+    global _activity_dirty
+    if not _activity_dirty:
+        return
+    save_activity_data(load_activity_data())
+    # Everything logged so far is now part of the snapshot
+    _get_activity_log().truncate(0)
+    _activity_dirty = False
+
+def _discard_activity_log_prefix(length: int):
+    """Drop the first `length` bytes of activity.log, keeping anything appended after them."""
+    log = _get_activity_log()
+    log.flush()
+    with open(ACTIVITY_LOG_FILE, 'rb') as f:
+        f.seek(length)
+        remainder = f.read()
+    log.truncate(0)
+    if remainder:
+        log.write(remainder.decode('utf-8'))
+
+async def flush_activity_data_job(context: ContextTypes.DEFAULT_TYPE):
+    """
+    Periodic flush through _flush_snapshot, so a slow disk doesn't stall the event loop.
+    The snapshot is serialized on the loop first, because the activity dict keeps changing
+    while the write is in flight.
+    """
+    global _activity_dirty
+    if not _activity_dirty:
+        return
+    async with FILE_LOCKS["activity"]:
+        data = load_activity_data()
+        payload = _json_dumps(data, indent=None)
+        logged_upto = _get_activity_log().tell()
+        _activity_dirty = False
+        try:
+            await _flush_snapshot(ACTIVITY_DATA_FILE, payload)
+        except Exception as e:
+            _activity_dirty = True
+            logger.error(f"Failed to flush activity data: {e}")
+            return
+        _store_cached(ACTIVITY_DATA_FILE, data)
+        # Only the log lines covered by the snapshot can go; updates logged during the write stay
+        _discard_activity_log_prefix(logged_upto)
+
+# Don't lose the last few minutes of activity on a clean shutdown
+atexit.register(flush_activity_data)
+
 # =============================
 # Hashtag Message Handler
 # =============================
+_HASHTAG_RE = re.compile(r'#(\w+)')
+
 async def hashtag_message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Handles messages containing hashtags, saving them (and any media) for later retrieval.
@@ -929,56 +1457,75 @@ async def hashtag_message_handler(update: Update, context: ContextTypes.DEFAULT_
     if not message:
         logger.debug("No message found in update for hashtag handler.")
         return
+    # Hashtags are only saved from users in groups; bail out before any text work otherwise
+    if not message.chat or message.chat.type not in _GROUP_CHAT_TYPES or not message.from_user:
+        return
     # Update user activity for inactivity tracking
-    if message.chat and message.from_user and message.chat.type in ["group", "supergroup"]:
-        update_user_activity(message.from_user.id, message.chat.id)
+    update_user_activity(message.from_user, message.chat)
     text = message.text or message.caption or ''
-    hashtags = re.findall(r'#(\w+)', text)
+    # Most messages have no '#' at all, so skip the regex for them
+    hashtags = _HASHTAG_RE.findall(text) if '#' in text else None
     if not hashtags:
         logger.debug("No hashtags found in message.")
         return
 
-    # Handle single media or text
+    # Handle single media or text. The entry is the same for every tag, so build it once
+    # and file it under each distinct (lowercased) tag, keeping first-seen order.
+    hashtags = list(dict.fromkeys(tag.lower() for tag in hashtags))
+    entry = {
+        'user_id': message.from_user.id,
+        'username': message.from_user.username,
+        'text': message.text if message.text else None,
+        'caption': message.caption if message.caption else None,
+        'message_id': message.message_id,
+        'chat_id': message.chat.id,
+        'media_group_id': None,
+        'photos': [],
+        'videos': []
+    }
+    if message.photo:
+        entry['photos'] = [message.photo[-1].file_id]
+    if message.video:
+        entry['videos'] = [message.video.file_id]
+    if message.document and message.document.mime_type and message.document.mime_type.startswith('video'):
+        entry['videos'].append(message.document.file_id)
+
     data = load_hashtag_data()
+    chat_key = str(message.chat.id)
+    saved_tags = []
     for tag in hashtags:
-        tag = tag.lower()
-        entry = {
-            'user_id': message.from_user.id,
-            'username': message.from_user.username,
-            'text': message.text if message.text else None,
-            'caption': message.caption if message.caption else None,
-            'message_id': message.message_id,
-            'chat_id': message.chat.id,
-            'media_group_id': None,
-            'photos': [],
-            'videos': []
-        }
-        if message.photo:
-            entry['photos'] = [message.photo[-1].file_id]
-        if message.video:
-            entry['videos'] = [message.video.file_id]
-        if message.document and message.document.mime_type and message.document.mime_type.startswith('video'):
-            entry['videos'].append(message.document.file_id)
-        data.setdefault(tag, []).append(entry)
+        bucket = data.setdefault(tag, {}).setdefault(chat_key, [])
+        # Edits and re-deliveries of an already saved message don't add a second copy
+        if any(saved.get('message_id') == message.message_id for saved in bucket):
+            continue
+        bucket.append(entry)
+        saved_tags.append(tag)
         logger.debug(f"Saved single message under tag #{tag}")
-    save_hashtag_data(data)
+    if not saved_tags:
+        return  # Nothing new to save or to tell the admins about
+    await append_hashtag_entries(chat_key, saved_tags, entry)
 
     # Notify admins privately
-    admins = await context.bot.get_chat_administrators(message.chat.id)
+    admins = await get_chat_administrators_cached(context.bot, message.chat.id)
     notification_text = (
         f"A new post from {message.from_user.mention_html()} in group {message.chat.title} "
         f"has been saved with the tag(s): {', '.join('#'+t for t in hashtags)}"
     )
-    for admin in admins:
+
+    async def notify_admin(admin):
         try:
             sent_message = await context.bot.send_message(chat_id=admin.user.id, text=notification_text, parse_mode='HTML')
             await schedule_message_deletion(context, sent_message)
         except Exception:
             logger.warning(f"Failed to notify admin {admin.user.id} about new hashtagged post.")
 
+    await asyncio.gather(*(notify_admin(admin) for admin in admins if not admin.user.is_bot))
+
 # =============================
 # Dynamic Hashtag Command Handler
 # =============================
+MEDIA_GROUP_LIMIT = 10  # Most items Telegram accepts in one send_media_group call
+
 async def dynamic_hashtag_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Handles dynamic hashtag commands (e.g. /mytag) to retrieve saved messages/media.
@@ -1012,36 +1559,91 @@ async def dynamic_hashtag_command(update: Update, context: ContextTypes.DEFAULT_
     if command in COMMAND_MAP:
         return
 
-    # Check if the command is a known hashtag command. If not, silently ignore.
-    data = load_hashtag_data()
-    if command not in data:
-        logger.debug(f"Unknown command '/{command}' not in hashtag data. Ignoring.")
+    # Check if the command is a known hashtag command in this chat. If not, silently ignore.
+    chat_id = update.effective_chat.id
+    entries = load_hashtag_data().get(command, {}).get(str(chat_id))
+    if not entries:
+        logger.debug(f"Unknown command '/{command}' not in hashtag data for chat {chat_id}. Ignoring.")
         return
 
     # If we are here, it's a valid hashtag command from an admin.
     found = False
-    for entry in data[command]:
-        # Send all photos
-        for photo_id in entry.get('photos', []):
-            sent_message = await context.bot.send_photo(chat_id=update.effective_chat.id, photo=photo_id, caption=entry.get('caption') or entry.get('text') or '')
-            await schedule_message_deletion(context, sent_message)
-            found = True
-        # Send all videos
-        for video_id in entry.get('videos', []):
-            sent_message = await context.bot.send_video(chat_id=update.effective_chat.id, video=video_id, caption=entry.get('caption') or entry.get('text') or '')
+    # Consecutive photos/videos are sent as albums of up to MEDIA_GROUP_LIMIT items
+    # instead of one API call per file, and all batches are dispatched concurrently.
+    sends = []
+    pending_media = []
+
+    async def send_and_schedule(send):
+        sent = await send
+        for sent_message in (sent if isinstance(sent, (list, tuple)) else [sent]):
             await schedule_message_deletion(context, sent_message)
+
+    def flush_media():
+        if not pending_media:
+            return
+        if len(pending_media) == 1:
+            # Telegram albums need at least two items
+            media = pending_media[0]
+            if isinstance(media, InputMediaPhoto):
+                send = context.bot.send_photo(chat_id=chat_id, photo=media.media, caption=media.caption)
+            else:
+                send = context.bot.send_video(chat_id=chat_id, video=media.media, caption=media.caption)
+        else:
+            send = context.bot.send_media_group(chat_id=chat_id, media=list(pending_media))
+        sends.append(send_and_schedule(send))
+        pending_media.clear()
+
+    for entry in entries:
+        caption = entry.get('caption') or entry.get('text') or ''
+        photos, videos = entry.get('photos', []), entry.get('videos', [])
+        # Send all photos, then all videos
+        for media in [InputMediaPhoto(media=photo_id, caption=caption) for photo_id in photos] + \
+                     [InputMediaVideo(media=video_id, caption=caption) for video_id in videos]:
+            pending_media.append(media)
             found = True
+            if len(pending_media) == MEDIA_GROUP_LIMIT:
+                flush_media()
         # Fallback for text/caption only
-        if not entry.get('photos') and not entry.get('videos') and (entry.get('text') or entry.get('caption')):
-            sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=entry.get('text') or entry.get('caption'))
-            await schedule_message_deletion(context, sent_message)
+        if not photos and not videos and (entry.get('text') or entry.get('caption')):
+            flush_media()  # Keep the media before this text in its own batch
+            sends.append(send_and_schedule(context.bot.send_message(chat_id=chat_id, text=entry.get('text') or entry.get('caption'))))
             found = True
+    flush_media()
+
+    results = await asyncio.gather(*sends, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Failed to send saved content for /{command} in chat {chat_id}: {result}")
 
     if not found:
         # This case might happen if a hashtag exists but has no content (e.g. empty list).
         # We should not send a message here, to be consistent with ignoring unknown commands.
         logger.debug(f"No saved messages or media for command: {command}, though tag exists.")
 
+# =============================
+# Media Helpers
+# =============================
+# Bot method used to send each stored media type. Looked up by name on the bot
+# instance so ExtBot's overrides (defaults, rate limiting) still apply.
+_MEDIA_SENDERS = {'photo': 'send_photo', 'video': 'send_video', 'voice': 'send_voice'}
+
+def extract_media(message):
+    """Returns (media_type, file_id) for a photo, video or voice message, or (None, None)."""
+    if message.photo:
+        return 'photo', message.photo[-1].file_id
+    if message.video:
+        return 'video', message.video.file_id
+    if message.voice:
+        return 'voice', message.voice.file_id
+    return None, None
+
+async def send_media(bot, chat_id, media_type: str, file_id: str, **kwargs):
+    """Sends stored media with the Bot method for its type; returns None for unknown types."""
+    method = _MEDIA_SENDERS.get(media_type)
+    if method is None:
+        return None
+    return await getattr(bot, method)(chat_id, file_id, **kwargs)
+
 # =============================
 # Risk Command
 # =============================
@@ -1075,31 +1677,28 @@ async def risk_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
 
     admin_data = load_admin_data()
     if not admin_data:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="The bot is not yet configured in any groups. Please use /update in a group first.")
+        sent_message = await _reply(update, text="The bot is not yet configured in any groups. Please use /update in a group first.")
         await schedule_message_deletion(context, sent_message)
         return ConversationHandler.END
 
-    all_group_ids = {group for groups in admin_data.values() for group in groups}
-    disabled_data = load_disabled_commands()
+    group_ids = list(get_all_group_ids() - get_groups_with_command_disabled('risk'))
 
+    # Look the titles up concurrently rather than one round-trip per group
+    titles = await asyncio.gather(*(get_chat_title(context.bot, group_id) for group_id in group_ids), return_exceptions=True)
     keyboard = []
-    for group_id in all_group_ids:
-        if 'risk' in disabled_data.get(str(group_id), []):
+    for group_id, title in zip(group_ids, titles):
+        if isinstance(title, Exception):
+            logger.warning(f"Could not fetch chat info for group {group_id}: {title}")
             continue
-
-        try:
-            chat = await context.bot.get_chat(int(group_id))
-            keyboard.append([InlineKeyboardButton(chat.title, callback_data=f"risk_group_{group_id}")])
-        except Exception as e:
-            logger.warning(f"Could not fetch chat info for group {group_id}: {e}")
+        keyboard.append([InlineKeyboardButton(title, callback_data=f"risk_group_{group_id}")])
 
     if not keyboard:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="There are no groups available for the /risk command right now.")
+        sent_message = await _reply(update, text="There are no groups available for the /risk command right now.")
         await schedule_message_deletion(context, sent_message)
         return ConversationHandler.END
 
     reply_markup = InlineKeyboardMarkup(keyboard)
-    await context.bot.send_message(chat_id=update.effective_chat.id, text="Choose a group where you want to risk your fate:", reply_markup=reply_markup)
+    await _reply(update, text="Choose a group where you want to risk your fate:", reply_markup=reply_markup)
     return SELECT_GROUP
 
 async def select_group_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -1107,13 +1706,12 @@ async def select_group_callback(update: Update, context: ContextTypes.DEFAULT_TY
     query = update.callback_query
     await query.answer()
 
-    group_id = query.data.replace("risk_group_", "")
+    group_id = query.data.removeprefix("risk_group_")
     context.user_data['risk_group_id'] = group_id
     context.user_data['risk_media'] = []  # Initialize list to store media
 
     try:
-        chat = await context.bot.get_chat(int(group_id))
-        group_name = chat.title
+        group_name = await get_chat_title(context.bot, group_id)
     except Exception:
         group_name = "the selected group"
 
@@ -1130,23 +1728,16 @@ async def receive_media_handler(update: Update, context: ContextTypes.DEFAULT_TY
     message = update.message
     media_list = context.user_data.get('risk_media', [])
 
-    media_type, file_id = None, None
-    if message.photo:
-        media_type, file_id = "photo", message.photo[-1].file_id
-    elif message.video:
-        media_type, file_id = "video", message.video.file_id
-    elif message.voice:
-        media_type, file_id = "voice", message.voice.file_id
-
+    media_type, file_id = extract_media(message)
     if not media_type:
-        await context.bot.send_message(chat_id=update.effective_chat.id, text="That's not a valid media type. Please send a photo, video, or voice note.")
+        await _reply(update, text="That's not a valid media type. Please send a photo, video, or voice note.")
         return AWAIT_MEDIA
 
     media_list.append({'type': media_type, 'id': file_id})
     context.user_data['risk_media'] = media_list
 
     if len(media_list) >= 4:
-        await context.bot.send_message(chat_id=update.effective_chat.id, text="You have reached the maximum of 4 media items.")
+        await _reply(update, text="You have reached the maximum of 4 media items.")
         return await _ask_for_save_consent(update, context)
     else:
         remaining = 4 - len(media_list)
@@ -1211,9 +1802,7 @@ async def _post_risk_batch(risks_to_post: list, caption: str, group_id: str, con
 
         # Post other media types individually
         for risk in other_media:
-            posted_message = None
-            if risk['media_type'] == 'voice':
-                posted_message = await context.bot.send_voice(group_id, risk['file_id'], caption=caption, parse_mode='HTML')
+            posted_message = await send_media(context.bot, group_id, risk['media_type'], risk['file_id'], caption=caption, parse_mode='HTML')
 
             if posted_message:
                 posted_message_ids.append(posted_message.message_id)
@@ -1239,7 +1828,7 @@ async def save_consent_callback(update: Update, context: ContextTypes.DEFAULT_TY
     user, group_id = update.effective_user, context.user_data.get('risk_group_id')
     media_list, allow_random = context.user_data.get('risk_media', []), context.user_data.get('allow_random')
 
-    should_post = random.choice([True, False])
+    should_post = bool(random.getrandbits(1))
     risk_data = load_risk_data()
     new_risks_batch = []
 
@@ -1317,27 +1906,49 @@ async def cancel_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     # Clean up all possible keys from different conversations
     conv_keys = [
         'risk_group_id', 'risk_media', 'allow_random', 'risk_ids_to_beg_for',
-        'post_group_id', 'post_media_type', 'post_file_id', 'post_caption'
+        'post_draft', 'post_group_titles'
     ]
     for key in conv_keys:
         context.user_data.pop(key, None)
 
-    await context.bot.send_message(chat_id=update.effective_chat.id, text=message_to_send)
+    await _reply(update, text=message_to_send)
     return ConversationHandler.END
 
 # =============================
 # SeeRisk Command
 # =============================
+SEERISK_SEND_CONCURRENCY = 5  # Max simultaneous media sends per /seerisk
+
+def _format_risk_timestamp(risk: dict) -> str:
+    from datetime import datetime
+    return datetime.fromtimestamp(risk['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+
+def _format_risk_caption(risk: dict, group_name: str) -> str:
+    """Builds the caption shown under a risk in /seerisk from the risk's current fields."""
+    # Compatibility for old data: check for 'risk_failed' first, then fall back to 'posted'
+    risk_outcome = "Failed" if risk.get('risk_failed', risk.get('posted')) else "Passed"
+    post_status = "Posted" if risk.get('posted_message_id') else "Not Posted"
+
+    status = f"Risk: {risk_outcome}, Status: {post_status}"
+    if risk.get('purged', False):
+        status += " [PURGED]"
+
+    return (
+        f"Risk taken on: {_format_risk_timestamp(risk)}\n"
+        f"Target Group: {group_name}\n"
+        f"Status: {status}"
+    )
+
 @command_handler_wrapper()
 async def seerisk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Admin command to see all risks taken by a specific user."""
     if not is_admin(update.effective_user.id):
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="You are not authorized to use this command.")
+        sent_message = await _reply(update, text="You are not authorized to use this command.")
         await schedule_message_deletion(context, sent_message)
         return
 
     if not context.args:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Usage: /seerisk <user_id or @username>")
+        sent_message = await _reply(update, text="Usage: /seerisk <user_id or @username>")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -1346,103 +1957,84 @@ async def seerisk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     risk_data = load_risk_data()
 
     if target_arg.startswith('@'):
-        target_username = target_arg[1:].lower()
-        # Search for the user ID corresponding to the username
-        for user_id_str, risks in risk_data.items():
-            if any(r.get('username', '').lower() == target_username for r in risks):
-                target_user_id = user_id_str
-                break
+        target_user_id = find_risk_user_id(target_arg[1:])
         if not target_user_id:
-            sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"No risk data found for username {target_arg}.")
+            sent_message = await _reply(update, text=f"No risk data found for username {target_arg}.")
             await schedule_message_deletion(context, sent_message)
             return
     elif target_arg.isdigit():
         target_user_id = target_arg
     else:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Invalid input. Please provide a valid user ID or a @username.")
+        sent_message = await _reply(update, text="Invalid input. Please provide a valid user ID or a @username.")
         await schedule_message_deletion(context, sent_message)
         return
 
     user_risks = risk_data.get(target_user_id)
 
     if not user_risks:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"No risk data found for user ID {target_user_id}.")
+        sent_message = await _reply(update, text=f"No risk data found for user ID {target_user_id}.")
         await schedule_message_deletion(context, sent_message)
         return
 
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Found {len(user_risks)} risk(s) for user ID {target_user_id}:")
+    sent_message = await _reply(update, text=f"Found {len(user_risks)} risk(s) for user ID {target_user_id}:")
     await schedule_message_deletion(context, sent_message)
 
-    for risk in user_risks:
-        try:
-            group_chat = await context.bot.get_chat(int(risk['group_id']))
-            group_name = group_chat.title
-        except Exception:
-            group_name = f"ID {risk['group_id']}"
-
-        from datetime import datetime
-        ts = datetime.fromtimestamp(risk['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+    # Resolve each distinct group's title once, all at the same time
+    risk_group_ids = list({risk['group_id'] for risk in user_risks})
+    titles = await asyncio.gather(*(get_chat_title(context.bot, group_id) for group_id in risk_group_ids), return_exceptions=True)
+    group_names = {
+        group_id: f"ID {group_id}" if isinstance(title, Exception) else title
+        for group_id, title in zip(risk_group_ids, titles)
+    }
 
-        # Compatibility for old data: check for 'risk_failed' first, then fall back to 'posted'
-        risk_failed_flag = risk.get('risk_failed', risk.get('posted'))
+    # Send the risks concurrently, a few at a time; media groups can't carry the per-risk buttons
+    semaphore = asyncio.Semaphore(SEERISK_SEND_CONCURRENCY)
 
-        risk_outcome = "Failed" if risk_failed_flag else "Passed"
-        post_status = "Posted" if risk.get('posted_message_id') else "Not Posted"
+    async def send_risk(risk):
+        async with semaphore:
+            caption = _format_risk_caption(risk, group_names[risk['group_id']])
+            # Compatibility for old data: check for 'risk_failed' first, then fall back to 'posted'
+            risk_failed_flag = risk.get('risk_failed', risk.get('posted'))
 
-        status = f"Risk: {risk_outcome}, Status: {post_status}"
-        if risk.get('purged', False):
-            status += " [PURGED]"
+            keyboard = []
+            # Allow posting only if the risk was failed and it's not already posted.
+            if risk_failed_flag and not risk.get('posted_message_id') and not risk.get('purged', False):
+                callback_data = f"postrisk_{risk['user_id']}_{risk['risk_id']}"
+                keyboard.append([InlineKeyboardButton("Post Now", callback_data=callback_data)])
 
-        caption = (
-            f"Risk taken on: {ts}\n"
-            f"Target Group: {group_name}\n"
-            f"Status: {status}"
-        )
+            # Add "Post with Taunt" button only if the risk is not purged.
+            if not risk.get('purged', False):
+                taunt_callback_data = f"posttaunt_{risk['user_id']}_{risk['risk_id']}"
+                keyboard.append([InlineKeyboardButton("Post with Taunt", callback_data=taunt_callback_data)])
+                # Add the new purge button here
+                purge_callback_data = f"purgenow_{risk['user_id']}_{risk['risk_id']}"
+                keyboard.append([InlineKeyboardButton("🚨 Purge 🚨", callback_data=purge_callback_data)])
 
-        keyboard = []
-        # Allow posting only if the risk was failed and it's not already posted.
-        if risk_failed_flag and not risk.get('posted_message_id') and not risk.get('purged', False):
-            callback_data = f"postrisk_{risk['user_id']}_{risk['risk_id']}"
-            keyboard.append([InlineKeyboardButton("Post Now", callback_data=callback_data)])
+            reply_markup = InlineKeyboardMarkup(keyboard) if keyboard else None
 
-        # Add "Post with Taunt" button only if the risk is not purged.
-        if not risk.get('purged', False):
-            taunt_callback_data = f"posttaunt_{risk['user_id']}_{risk['risk_id']}"
-            keyboard.append([InlineKeyboardButton("Post with Taunt", callback_data=taunt_callback_data)])
-            # Add the new purge button here
-            purge_callback_data = f"purgenow_{risk['user_id']}_{risk['risk_id']}"
-            keyboard.append([InlineKeyboardButton("🚨 Purge 🚨", callback_data=purge_callback_data)])
+            media_type = risk['media_type']
+            file_id = risk['file_id']
 
-        reply_markup = InlineKeyboardMarkup(keyboard) if keyboard else None
+            try:
+                sent_message = await send_media(context.bot, update.effective_chat.id, media_type, file_id, caption=caption, reply_markup=reply_markup)
 
-        media_type = risk['media_type']
-        file_id = risk['file_id']
+                # If a message was sent and it had buttons, record it for later editing.
+                if sent_message and reply_markup:
+                    if 'seerisk_messages' not in risk:
+                        risk['seerisk_messages'] = []
+                    risk['seerisk_messages'].append({
+                        'chat_id': sent_message.chat.id,
+                        'message_id': sent_message.message_id
+                    })
 
-        try:
-            sent_message = None
-            if media_type == 'photo':
-                sent_message = await context.bot.send_photo(update.effective_chat.id, file_id, caption=caption, reply_markup=reply_markup)
-            elif media_type == 'video':
-                sent_message = await context.bot.send_video(update.effective_chat.id, file_id, caption=caption, reply_markup=reply_markup)
-            elif media_type == 'voice':
-                sent_message = await context.bot.send_voice(update.effective_chat.id, file_id, caption=caption, reply_markup=reply_markup)
-
-            # If a message was sent and it had buttons, record it for later editing.
-            if sent_message and reply_markup:
-                if 'seerisk_messages' not in risk:
-                    risk['seerisk_messages'] = []
-                risk['seerisk_messages'].append({
-                    'chat_id': sent_message.chat.id,
-                    'message_id': sent_message.message_id
-                })
-
-            if sent_message:
-                await schedule_message_deletion(context, sent_message)
+                if sent_message:
+                    await schedule_message_deletion(context, sent_message)
 
-        except Exception as e:
-            error_message = await context.bot.send_message(update.effective_chat.id, text=f"Could not retrieve media for a risk from {ts}. It might be too old or deleted. Error: {e}")
-            await schedule_message_deletion(context, error_message)
+            except Exception as e:
+                error_message = await _reply(update, text=f"Could not retrieve media for a risk from {_format_risk_timestamp(risk)}. It might be too old or deleted. Error: {e}")
+                await schedule_message_deletion(context, error_message)
 
+    await asyncio.gather(*(send_risk(risk) for risk in user_risks))
     save_risk_data(risk_data)
 
 
@@ -1450,21 +2042,17 @@ async def post_risk_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
     """Callback to post a specific risk to its group."""
     query = update.callback_query
     await query.answer()
+    if is_duplicate_callback(query):
+        return
 
     try:
-        _, user_id, risk_id = query.data.split('_')
+        _, user_id, risk_id = split_risk_callback_data(query.data)
     except ValueError:
         await query.edit_message_text("Error: Invalid callback data.")
         return
 
     risk_data = load_risk_data()
-    user_risks = risk_data.get(user_id, [])
-
-    target_risk = None
-    for risk in user_risks:
-        if risk['risk_id'] == risk_id:
-            target_risk = risk
-            break
+    target_risk = get_risk(user_id, risk_id)
 
     if not target_risk:
         await query.edit_message_text("Error: Could not find this risk. It may have been deleted.")
@@ -1487,23 +2075,19 @@ async def post_risk_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
         file_id = target_risk['file_id']
         group_id = target_risk['group_id']
 
-        posted_message = None
-        if media_type == 'photo':
-            posted_message = await context.bot.send_photo(group_id, file_id, caption=caption, parse_mode='HTML')
-        elif media_type == 'video':
-            posted_message = await context.bot.send_video(group_id, file_id, caption=caption, parse_mode='HTML')
-        elif media_type == 'voice':
-            posted_message = await context.bot.send_voice(group_id, file_id, caption=caption, parse_mode='HTML')
+        posted_message = await send_media(context.bot, group_id, media_type, file_id, caption=caption, parse_mode='HTML')
 
         # Update the risk data
         if posted_message:
             target_risk['posted_message_id'] = posted_message.message_id
         save_risk_data(risk_data)
 
-        # Update the admin's message
-        original_caption = query.message.caption
-        new_caption = original_caption.replace("Status: Not Posted", "Status: Posted")
-        await query.edit_message_caption(caption=new_caption, reply_markup=None)
+        # Rebuild the admin's caption from the updated risk
+        try:
+            group_name = await get_chat_title(context.bot, group_id)
+        except Exception:
+            group_name = f"ID {group_id}"
+        await query.edit_message_caption(caption=_format_risk_caption(target_risk, group_name), reply_markup=None)
         sent_message = await context.bot.send_message(chat_id=query.message.chat_id, text="Media has been posted to the group.")
         await schedule_message_deletion(context, sent_message)
 
@@ -1517,17 +2101,18 @@ async def post_risk_with_taunt_callback(update: Update, context: ContextTypes.DE
     """Callback to post a specific risk to its group with a taunting message."""
     query = update.callback_query
     await query.answer()
+    if is_duplicate_callback(query):
+        return
 
     try:
         # Callback format is "posttaunt_{user_id}_{risk_id}"
-        _, user_id, risk_id = query.data.split('_')
+        _, user_id, risk_id = split_risk_callback_data(query.data)
     except ValueError:
         await query.edit_message_text("Error: Invalid callback data for taunt.")
         return
 
     risk_data = load_risk_data()
-    user_risks = risk_data.get(user_id, [])
-    target_risk = next((r for r in user_risks if r['risk_id'] == risk_id), None)
+    target_risk = get_risk(user_id, risk_id)
 
     if not target_risk:
         await query.edit_message_text("Error: Could not find this risk. It may have been deleted.")
@@ -1546,13 +2131,7 @@ async def post_risk_with_taunt_callback(update: Update, context: ContextTypes.DE
         file_id = target_risk['file_id']
         group_id = target_risk['group_id']
 
-        posted_message = None
-        if media_type == 'photo':
-            posted_message = await context.bot.send_photo(group_id, file_id, caption=caption, parse_mode='HTML')
-        elif media_type == 'video':
-            posted_message = await context.bot.send_video(group_id, file_id, caption=caption, parse_mode='HTML')
-        elif media_type == 'voice':
-            posted_message = await context.bot.send_voice(group_id, file_id, caption=caption, parse_mode='HTML')
+        posted_message = await send_media(context.bot, group_id, media_type, file_id, caption=caption, parse_mode='HTML')
 
         if posted_message:
             target_risk['posted_message_id'] = posted_message.message_id
@@ -1587,7 +2166,7 @@ async def purge_risk_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
     await query.answer()
 
     try:
-        _, user_id, risk_id = query.data.split('_')
+        _, user_id, risk_id = split_risk_callback_data(query.data)
     except ValueError:
         await query.edit_message_caption(caption=query.message.caption + "\n\nError: Invalid callback data.", reply_markup=None)
         return
@@ -1616,9 +2195,11 @@ async def purge_risk_confirmation_callback(update: Update, context: ContextTypes
     """Handles the final confirmation of purging a single risk from the /seerisk view."""
     query = update.callback_query
     await query.answer()
+    if is_duplicate_callback(query):
+        return
 
     try:
-        action, user_id, risk_id = query.data.split('_')
+        action, user_id, risk_id = split_risk_callback_data(query.data)
     except ValueError:
         await query.edit_message_caption(caption=query.message.caption + "\n\nError: Invalid callback data.", reply_markup=None)
         return
@@ -1628,8 +2209,7 @@ async def purge_risk_confirmation_callback(update: Update, context: ContextTypes
 
     if action == "purgeconfirm":
         risk_data = load_risk_data()
-        user_risks = risk_data.get(user_id, [])
-        risk_to_purge = next((r for r in user_risks if r['risk_id'] == risk_id), None)
+        risk_to_purge = get_risk(user_id, risk_id)
 
         if not risk_to_purge:
             await query.edit_message_caption(caption=original_caption + "\n\nError: Risk not found or already handled.", reply_markup=None)
@@ -1657,26 +2237,24 @@ async def purge_risk_confirmation_callback(update: Update, context: ContextTypes
         await query.edit_message_caption(caption=original_caption + "\n\nPurge cancelled.", reply_markup=None)
 
 
+PURGE_DELETE_CONCURRENCY = 5  # Max simultaneous delete_message calls per purge
+
 async def _delete_and_mark_risks(risks_to_process: list, context: ContextTypes.DEFAULT_TYPE) -> tuple[int, int]:
     """
     Deletes posted messages and marks risks as purged in the database.
     Returns counts of successful and failed deletions.
     """
-    success_count = 0
-    failure_count = 0
-
     if not risks_to_process:
         return 0, 0
 
     user_id = risks_to_process[0]['user_id']
     risk_data = load_risk_data()
-    user_risks = risk_data.get(str(user_id), [])
 
     # Use a set to avoid deleting the same message multiple times if risks share message IDs
     messages_to_delete = set()
 
     for risk_to_purge in risks_to_process:
-        risk_in_db = next((r for r in user_risks if r['risk_id'] == risk_to_purge['risk_id']), None)
+        risk_in_db = get_risk(user_id, risk_to_purge['risk_id'])
         if not risk_in_db:
             continue
 
@@ -1694,15 +2272,22 @@ async def _delete_and_mark_risks(risks_to_process: list, context: ContextTypes.D
         risk_in_db['posted_message_ids'] = []
         risk_in_db.pop('seerisk_messages', None)
 
-    # Delete all unique messages
-    for group_id, message_id in messages_to_delete:
-        try:
-            await context.bot.delete_message(chat_id=group_id, message_id=message_id)
-            logger.info(f"Successfully purged message {message_id} in group {group_id}.")
-            success_count += 1
-        except Exception as e:
-            logger.error(f"Failed to delete message {message_id} in group {group_id}: {e}")
-            failure_count += 1
+    # Delete all unique messages concurrently, a few at a time to stay clear of flood limits
+    semaphore = asyncio.Semaphore(PURGE_DELETE_CONCURRENCY)
+
+    async def delete_one(group_id, message_id):
+        async with semaphore:
+            try:
+                await context.bot.delete_message(chat_id=group_id, message_id=message_id)
+                logger.info(f"Successfully purged message {message_id} in group {group_id}.")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to delete message {message_id} in group {group_id}: {e}")
+                return False
+
+    results = await asyncio.gather(*(delete_one(group_id, message_id) for group_id, message_id in messages_to_delete))
+    success_count = sum(results)
+    failure_count = len(results) - success_count
 
     save_risk_data(risk_data)
     return success_count, failure_count
@@ -1752,13 +2337,10 @@ async def purge_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
             return ConversationHandler.END
 
         user_risks = risk_data.get(target_user_id, [])
-        disabled_commands = load_disabled_commands()
 
         # Admin purge considers all risks, not just those with a posted_message_id
-        risks_to_process = []
-        for risk in user_risks:
-            if 'purge' not in disabled_commands.get(str(risk['group_id']), []):
-                risks_to_process.append(risk)
+        purge_disabled = get_groups_with_command_disabled('purge')
+        risks_to_process = [risk for risk in user_risks if str(risk['group_id']) not in purge_disabled]
 
         if not risks_to_process:
             await update.message.reply_text(f"User {target_user_id} has no risks that can be purged (they may all be in groups where /purge is disabled).")
@@ -1785,21 +2367,17 @@ async def purge_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         await update.message.reply_text("You have no active, posted risks to purge.")
         return ConversationHandler.END
 
-    disabled_commands = load_disabled_commands()
     conditions_data = load_conditions_data()
 
     risks_with_conditions = []
     risks_without_conditions = []
-    disabled_groups_info = set()
+    disabled_group_ids = set()
+    purge_disabled = get_groups_with_command_disabled('purge')
 
     for risk in risks_to_purge:
         group_id = risk['group_id']
-        if 'purge' in disabled_commands.get(str(group_id), []):
-            try:
-                chat_info = await context.bot.get_chat(int(group_id))
-                disabled_groups_info.add(chat_info.title)
-            except Exception:
-                disabled_groups_info.add(f"Group ID {group_id}")
+        if str(group_id) in purge_disabled:
+            disabled_group_ids.add(group_id)
             continue
 
         if isinstance(conditions_data, dict) and conditions_data.get(group_id):
@@ -1807,6 +2385,14 @@ async def purge_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
         else:
             risks_without_conditions.append(risk)
 
+    # Name the groups where purging is disabled, fetching all their titles at once
+    disabled_group_ids = list(disabled_group_ids)
+    titles = await asyncio.gather(*(get_chat_title(context.bot, group_id) for group_id in disabled_group_ids), return_exceptions=True)
+    disabled_groups_info = {
+        f"Group ID {group_id}" if isinstance(title, Exception) else title
+        for group_id, title in zip(disabled_group_ids, titles)
+    }
+
     total_purgeable = len(risks_with_conditions) + len(risks_without_conditions)
     if total_purgeable == 0:
         await update.message.reply_text("The purge feature is currently disabled in all groups where you have posted risks.")
@@ -1835,6 +2421,8 @@ async def purge_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
 
     return CONFIRM_PURGE
 
+ADMIN_NOTIFY_CONCURRENCY = 25  # Max simultaneous admin notifications
+
 async def send_random_condition(user: User, user_data: dict, context: ContextTypes.DEFAULT_TYPE):
     """Selects a random condition from applicable groups, sends it to the user, and notifies admins."""
     risks_to_purge = user_data.get('risks_to_purge', []) # These are now only the risks with conditions
@@ -1884,14 +2472,8 @@ async def send_random_condition(user: User, user_data: dict, context: ContextTyp
     await schedule_message_deletion(context, sent_message)
 
     # The rest of the logic for notifying admins remains the same, as it's already based on the groups from risks_to_purge
-    group_ids = {r['group_id'] for r in risks_to_purge}
-    admin_ids = set()
-    admin_data = load_admin_data()
-    for admin_id, groups in admin_data.items():
-        if any(g in group_ids for g in groups):
-            admin_ids.add(int(admin_id))
-    if is_owner(OWNER_ID):
-        admin_ids.add(OWNER_ID)
+    admin_ids = get_admin_ids_for_groups({r['group_id'] for r in risks_to_purge})
+    admin_ids.add(OWNER_ID)
 
     keyboard = [[InlineKeyboardButton("✅ Approve", callback_data=f"purge_verify_approve_{user.id}"), InlineKeyboardButton("❌ Deny", callback_data=f"purge_verify_deny_{user.id}")]]
     reply_markup = InlineKeyboardMarkup(keyboard)
@@ -1901,12 +2483,18 @@ async def send_random_condition(user: User, user_data: dict, context: ContextTyp
         f"<b>Condition to verify:</b>\n<i>{html.escape(condition['text'])}</i>\n\n"
         f"Please confirm whether the user has met this condition."
     )
-    for admin_id in admin_ids:
-        try:
-            sent_message = await context.bot.send_message(chat_id=admin_id, text=notification_text, reply_markup=reply_markup, parse_mode='HTML')
-            await schedule_message_deletion(context, sent_message)
-        except Exception as e:
-            logger.warning(f"Failed to send purge verification to admin {admin_id}: {e}")
+    # Notify all admins at once, capped to stay inside Telegram's global send rate
+    semaphore = asyncio.Semaphore(ADMIN_NOTIFY_CONCURRENCY)
+
+    async def notify_admin(admin_id):
+        async with semaphore:
+            try:
+                sent_message = await context.bot.send_message(chat_id=admin_id, text=notification_text, reply_markup=reply_markup, parse_mode='HTML')
+                await schedule_message_deletion(context, sent_message)
+            except Exception as e:
+                logger.warning(f"Failed to send purge verification to admin {admin_id}: {e}")
+
+    await asyncio.gather(*(notify_admin(admin_id) for admin_id in admin_ids))
 
     return AWAIT_CONDITION_VERIFICATION
 
@@ -1954,53 +2542,98 @@ async def purge_confirmation_callback(update: Update, context: ContextTypes.DEFA
 # /post Command Conversation
 # =============================
 
+async def _run_approved_purge(user_id: int, user_data: dict, risks_to_purge: list, context: ContextTypes.DEFAULT_TYPE):
+    """Purges the risks an admin approved and reports the result to the user."""
+    try:
+        success_count, failure_count = await _delete_and_mark_risks(risks_to_purge, context)
+
+        response_message = (
+            f"An admin has approved your request.\n"
+            f"✅ Successfully deleted {success_count} posts and marked as purged.\n"
+            f"❌ Failed to delete {failure_count} posts (but they were still marked as purged)."
+        )
+        await context.bot.send_message(chat_id=user_id, text=response_message)
+    except Exception as e:
+        logger.error(f"Approved purge for user {user_id} failed: {e}")
+    finally:
+        # Clean up all related data after the final step
+        user_data.pop('current_condition', None)
+        user_data.pop('risks_to_purge_with_conditions', None)
+        user_data.pop('risks_to_purge_without_conditions', None) # Clean this up too for completeness
+
+# The admin's purge request message after a decision; shared by the approve and deny branches
+_PURGE_DECISION_TEMPLATE = "{text}\n\n---\n{status} by {mention}"
+
 async def purge_verification_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handles an admin's verification of a purge condition."""
     query = update.callback_query
     await query.answer()
+    if is_duplicate_callback(query):
+        return
 
     admin_user = query.from_user
-    try:
-        _, _, decision, user_id_str = query.data.split('_')
-        user_id = int(user_id_str)
-    except (ValueError, IndexError):
+    # Callback format is "purge_verify_<approve|deny>_<user_id>"
+    prefix, _, user_id_str = query.data.rpartition('_')
+    decision = prefix.removeprefix('purge_verify_')
+    if decision not in ('approve', 'deny') or not user_id_str.isdigit():
         await query.edit_message_text("Error: Invalid callback data.")
         return
+    user_id = int(user_id_str)
 
     user_data = context.application.user_data.get(user_id)
     if not user_data or 'risks_to_purge' not in user_data:
         await query.edit_message_text(text="This purge request is no longer valid or has been cancelled by the user.")
         return
 
-    original_message_text = query.message.text
+    # The request text arrives as plain text, so escape it before re-sending it as HTML
+    # (a stray '<' from the condition would otherwise make Telegram reject the edit)
+    request_text = html.escape(query.message.text or '')
+    admin_mention = admin_user.mention_html()
 
     if decision == 'approve':
-        await query.edit_message_text(text=f"{original_message_text}\n\n---\n✅ Approved by {admin_user.mention_html()}", parse_mode='HTML')
+        # Take the risks out of user_data right away so a second approval can't start the purge again
+        risks_to_purge = user_data.pop('risks_to_purge', [])
+        await query.edit_message_text(text=_PURGE_DECISION_TEMPLATE.format(text=request_text, status="✅ Approved", mention=admin_mention), parse_mode=ParseMode.HTML)
 
-        risks_to_purge = user_data.get('risks_to_purge', [])
-
-        success_count, failure_count = await _delete_and_mark_risks(risks_to_purge, context)
+        # The deletions can take a while, so run them in the background and let this callback return
+        context.application.create_task(_run_approved_purge(user_id, user_data, risks_to_purge, context), update=update)
 
-        response_message = (
-            f"An admin has approved your request.\n"
-            f"✅ Successfully deleted {success_count} posts and marked as purged.\n"
-            f"❌ Failed to delete {failure_count} posts (but they were still marked as purged)."
+    elif decision == 'deny':
+        # Update the admin's message, tell the user and fetch their chat for the new condition all at once
+        edit_result, notify_result, user_object = await asyncio.gather(
+            query.edit_message_text(text=_PURGE_DECISION_TEMPLATE.format(text=request_text, status="❌ Denied", mention=admin_mention), parse_mode=ParseMode.HTML),
+            context.bot.send_message(chat_id=user_id, text="An admin has denied your request. You will now be given a new condition."),
+            context.bot.get_chat(user_id),
+            return_exceptions=True
         )
-        await context.bot.send_message(chat_id=user_id, text=response_message)
+        for result in (edit_result, notify_result):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to report purge denial for user {user_id}: {result}")
+        if isinstance(user_object, Exception):
+            logger.error(f"Could not fetch chat for user {user_id} after purge denial: {user_object}")
+            return
 
-        # Clean up all related data after the final step
-        user_data.pop('risks_to_purge', None)
-        user_data.pop('current_condition', None)
-        user_data.pop('risks_to_purge_with_conditions', None)
-        user_data.pop('risks_to_purge_without_conditions', None) # Clean this up too for completeness
+        await send_random_condition(user_object, user_data, context)
 
-    elif decision == 'deny':
-        await query.edit_message_text(text=f"{original_message_text}\n\n---\n❌ Denied by {admin_user.mention_html()}", parse_mode='HTML')
-        await context.bot.send_message(chat_id=user_id, text="An admin has denied your request. You will now be given a new condition.")
 
-        user_object = await context.bot.get_chat(user_id)
-        await send_random_condition(user_object, user_data, context)
+# One lock per target group. The confirmation step runs with block=False, so two admins
+# confirming posts for the same group at once still reach it in confirmation order.
+_POST_SEND_LOCKS = defaultdict(asyncio.Lock)
+# The preview and the confirmed send both run with block=False, so their media sends can
+# overlap across admins; the semaphore caps how many are in flight at once
+POST_SEND_CONCURRENCY = 25  # Max simultaneous /post media sends across all admins
+_POST_SEND_SEMAPHORE = asyncio.Semaphore(POST_SEND_CONCURRENCY)
 
+@dataclass(slots=True)
+class PostDraft:
+    """The post an admin is building in the /post conversation, kept under user_data['post_draft']."""
+    group_id: str
+    media_type: Optional[str] = None
+    file_id: Optional[str] = None
+    caption: Optional[str] = None
+
+    def is_complete(self) -> bool:
+        return all([self.group_id, self.media_type, self.file_id, self.caption])
 
 async def post_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Starts the /post conversation. Asks admin to select a group to post in."""
@@ -2021,41 +2654,41 @@ async def post_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
             pass # Ignore if user has not started a chat with the bot
         return ConversationHandler.END
 
-    if not is_admin(user_id):
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="This is an admin-only command. You are not authorized.")
-        await schedule_message_deletion(context, sent_message)
-        return ConversationHandler.END
-
-    admin_data = load_admin_data()
-    # In Python 3, .get() on a dictionary with a default value is safe.
+    # The user's admin groups double as the admin check; only the owner is an admin without any.
     # The user_id needs to be a string for JSON key matching.
-    user_admin_groups = admin_data.get(str(user_id), [])
+    user_admin_groups = load_admin_data().get(str(user_id), [])
 
     if not user_admin_groups:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="You are not registered as an admin in any groups that I'm aware of. Try running /update in a group where you are an admin.")
+        if is_owner(user_id):
+            text = "You are not registered as an admin in any groups that I'm aware of. Try running /update in a group where you are an admin."
+        else:
+            text = "This is an admin-only command. You are not authorized."
+        sent_message = await _reply(update, text=text)
         await schedule_message_deletion(context, sent_message)
         return ConversationHandler.END
 
-    disabled_data = load_disabled_commands()
-    keyboard = []
-    for group_id in user_admin_groups:
-        # Check if 'post' command is disabled for this group
-        if 'post' in disabled_data.get(str(group_id), []):
-            continue  # Skip this group
-
-        try:
-            chat = await context.bot.get_chat(int(group_id))
-            keyboard.append([InlineKeyboardButton(chat.title, callback_data=f"post_group_{group_id}")])
-        except Exception as e:
-            logger.warning(f"Could not fetch chat info for group {group_id} for /post command: {e}")
+    # Skip groups where the 'post' command is disabled
+    post_disabled = get_groups_with_command_disabled('post')
+    # Sorted so the keyboard lists the groups in a stable order
+    group_ids = sorted((group_id for group_id in map(str, user_admin_groups) if group_id not in post_disabled), key=int)
+
+    # Look the titles up concurrently; get_chat_title serves repeat /post calls from its cache
+    titles = await asyncio.gather(*(get_chat_title(context.bot, group_id) for group_id in group_ids), return_exceptions=True)
+    for group_id, title in zip(group_ids, titles):
+        if isinstance(title, Exception):
+            logger.warning(f"Could not fetch chat info for group {group_id} for /post command: {title}")
+    post_group_titles = {group_id: title for group_id, title in zip(group_ids, titles) if not isinstance(title, Exception)}
+    keyboard = [[InlineKeyboardButton(title, callback_data=f"post_group_{group_id}")] for group_id, title in post_group_titles.items()]
+    # Remembered so the selection step can name the group without another lookup
+    context.user_data['post_group_titles'] = post_group_titles
 
     if not keyboard:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="There are no available groups for you to post in. The /post command may be disabled in the groups where you are an admin.")
+        sent_message = await _reply(update, text="There are no available groups for you to post in. The /post command may be disabled in the groups where you are an admin.")
         await schedule_message_deletion(context, sent_message)
         return ConversationHandler.END
 
     reply_markup = InlineKeyboardMarkup(keyboard)
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Please choose a group to post your message in:", reply_markup=reply_markup)
+    sent_message = await _reply(update, text="Please choose a group to post your message in:", reply_markup=reply_markup)
     await schedule_message_deletion(context, sent_message)
     return SELECT_POST_GROUP
 
@@ -2064,14 +2697,10 @@ async def select_post_group_callback(update: Update, context: ContextTypes.DEFAU
     query = update.callback_query
     await query.answer()
 
-    group_id = query.data.replace("post_group_", "")
-    context.user_data['post_group_id'] = group_id
+    group_id = query.data.removeprefix("post_group_")
+    context.user_data['post_draft'] = PostDraft(group_id=group_id)
 
-    try:
-        chat = await context.bot.get_chat(int(group_id))
-        group_name = chat.title
-    except Exception:
-        group_name = "the selected group"
+    group_name = context.user_data.pop('post_group_titles', {}).get(group_id, "the selected group")
 
     await query.edit_message_text(text=f"You have selected '{group_name}'.\n\nPlease send the media (photo or video) for your post.")
     return AWAIT_POST_MEDIA
@@ -2079,24 +2708,17 @@ async def select_post_group_callback(update: Update, context: ContextTypes.DEFAU
 async def receive_post_media_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Handles receiving the media for the post."""
     message = update.message
-    media_type = None
-    file_id = None
-
-    if message.photo:
-        media_type = "photo"
-        file_id = message.photo[-1].file_id
-    elif message.video:
-        media_type = "video"
-        file_id = message.video.file_id
-    else:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="This is not a valid media type. Please send a photo or a video.")
+    media_type, file_id = extract_media(message)
+    if media_type not in ('photo', 'video'):
+        sent_message = await _reply(update, text="This is not a valid media type. Please send a photo or a video.")
         await schedule_message_deletion(context, sent_message)
         return AWAIT_POST_MEDIA # Remain in the same state
 
-    context.user_data['post_media_type'] = media_type
-    context.user_data['post_file_id'] = file_id
+    draft = context.user_data['post_draft']
+    draft.media_type = media_type
+    draft.file_id = file_id
 
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Media received. Now, please enter the caption for your post.")
+    sent_message = await _reply(update, text="Media received. Now, please enter the caption for your post.")
     await schedule_message_deletion(context, sent_message)
     return AWAIT_POST_CAPTION
 
@@ -2104,16 +2726,17 @@ async def receive_post_caption_handler(update: Update, context: ContextTypes.DEF
     """Handles receiving the caption and shows a preview."""
     caption = update.message.text
     if not caption:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Please provide a caption for your post.")
+        sent_message = await _reply(update, text="Please provide a caption for your post.")
         await schedule_message_deletion(context, sent_message)
         return AWAIT_POST_CAPTION
 
-    context.user_data['post_caption'] = caption
-    media_type = context.user_data['post_media_type']
-    file_id = context.user_data['post_file_id']
+    draft = context.user_data['post_draft']
+    draft.caption = caption
+    media_type = draft.media_type
+    file_id = draft.file_id
 
     # Show preview
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Here is a preview of your post:")
+    sent_message = await _reply(update, text="Here is a preview of your post:")
     await schedule_message_deletion(context, sent_message)
 
     keyboard = [
@@ -2125,13 +2748,11 @@ async def receive_post_caption_handler(update: Update, context: ContextTypes.DEF
     reply_markup = InlineKeyboardMarkup(keyboard)
 
     try:
-        if media_type == 'photo':
-            await context.bot.send_photo(update.effective_chat.id, file_id, caption=caption, reply_markup=reply_markup)
-        elif media_type == 'video':
-            await context.bot.send_video(update.effective_chat.id, file_id, caption=caption, reply_markup=reply_markup)
+        async with _POST_SEND_SEMAPHORE:
+            await send_media(context.bot, update.effective_chat.id, media_type, file_id, caption=caption, reply_markup=reply_markup)
     except Exception as e:
         logger.error(f"Error sending preview for /post command: {e}")
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="There was an error showing the preview. Please try again.")
+        sent_message = await _reply(update, text="There was an error showing the preview. Please try again.")
         await schedule_message_deletion(context, sent_message)
         return AWAIT_POST_MEDIA
 
@@ -2141,33 +2762,38 @@ async def post_confirmation_callback(update: Update, context: ContextTypes.DEFAU
     """Handles the final confirmation from the admin."""
     query = update.callback_query
     await query.answer()
+    if is_duplicate_callback(query):
+        return None  # Leave the conversation state to the first press
 
     # It's good practice to remove the buttons from the preview message to prevent double-clicks
     await query.edit_message_reply_markup(reply_markup=None)
 
     if query.data == 'post_confirm':
-        group_id = context.user_data.get('post_group_id')
-        media_type = context.user_data.get('post_media_type')
-        file_id = context.user_data.get('post_file_id')
-        caption = context.user_data.get('post_caption')
+        draft = context.user_data.get('post_draft')
 
-        if not all([group_id, media_type, file_id, caption]):
+        if draft is None or not draft.is_complete():
             sent_message = await context.bot.send_message(
                 chat_id=query.message.chat_id,
                 text="An error occurred, some information was lost. Please start over with /post."
             )
             await schedule_message_deletion(context, sent_message)
             # Clean up potentially partial data
-            for key in ['post_group_id', 'post_media_type', 'post_file_id', 'post_caption']:
-                context.user_data.pop(key, None)
+            context.user_data.pop('post_draft', None)
             return ConversationHandler.END
 
+        group_id, media_type, file_id, caption = draft.group_id, draft.media_type, draft.file_id, draft.caption
+
         try:
-            if media_type == 'photo':
-                sent_message = await context.bot.send_photo(group_id, file_id, caption=caption)
-            elif media_type == 'video':
-                sent_message = await context.bot.send_video(group_id, file_id, caption=caption)
-            await schedule_message_deletion(context, sent_message)
+            # Posts to the same group go out in confirmation order; other groups aren't held up
+            async with _POST_SEND_LOCKS[group_id], _POST_SEND_SEMAPHORE:
+                # Clone the (now button-less) preview server-side rather than sending the file again
+                try:
+                    copied = await context.bot.copy_message(chat_id=group_id, from_chat_id=query.message.chat_id, message_id=query.message.message_id)
+                    _schedule_deletion(int(group_id), copied.message_id)
+                except Exception as e:
+                    logger.warning(f"Could not copy /post preview to group {group_id}, sending the media instead: {e}")
+                    sent_message = await send_media(context.bot, group_id, media_type, file_id, caption=caption)
+                    await schedule_message_deletion(context, sent_message)
 
             # Send a new message as confirmation
             sent_message = await context.bot.send_message(
@@ -2191,8 +2817,7 @@ async def post_confirmation_callback(update: Update, context: ContextTypes.DEFAU
         await schedule_message_deletion(context, sent_message)
 
     # Clean up user_data
-    for key in ['post_group_id', 'post_media_type', 'post_file_id', 'post_caption']:
-        context.user_data.pop(key, None)
+    context.user_data.pop('post_draft', None)
 
     return ConversationHandler.END
 
@@ -2209,81 +2834,109 @@ COMMAND_MAP = {
     'addcondition': {'is_admin': True}, 'listconditions': {'is_admin': True}, 'removecondition': {'is_admin': True},
 }
 
+# Sorted command names for /command, split by audience once at import.
+# start and help are not shown in the group list.
+_EVERYONE_CMDS = tuple(sorted(cmd for cmd, info in COMMAND_MAP.items() if not info['is_admin'] and cmd not in ('start', 'help')))
+_ADMIN_CMDS = tuple(sorted(cmd for cmd, info in COMMAND_MAP.items() if info['is_admin']))
+
 @command_handler_wrapper(admin_only=False)
 async def command_list_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     Dynamically lists all available commands based on user's admin status and disabled commands.
     """
     if update.effective_chat.type == "private":
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Please use this command in a group to see the available commands for that group.")
+        sent_message = await _reply(update, text="Please use this command in a group to see the available commands for that group.")
         await schedule_message_deletion(context, sent_message)
         return
 
-    group_id = str(update.effective_chat.id)
-    disabled_cmds = set(load_disabled_commands().get(group_id, []))
-
-    member = await context.bot.get_chat_member(update.effective_chat.id, update.effective_user.id)
-    is_admin_user = member.status in [ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER]
+    group_id = update.effective_chat.id
+    disabled_cmds = get_disabled_commands(group_id)
 
-    everyone_cmds = []
-    admin_only_cmds = []
+    # Only decides which commands to list, so the cached admin list is good enough
+    is_admin_user = await is_chat_admin(context.bot, update.effective_chat.id, update.effective_user.id)
 
     # Static commands from COMMAND_MAP
-    for cmd, info in sorted(COMMAND_MAP.items()):
-        if cmd in ['start', 'help']:  # Don't show these in the group list
-            continue
+    if is_admin_user:
+        # Admins see all commands, with disabled ones marked
+        everyone_cmds = [f"/{cmd} (disabled)" if cmd in disabled_cmds else f"/{cmd}" for cmd in _EVERYONE_CMDS]
+        admin_only_cmds = [f"/{cmd} (disabled)" if cmd in disabled_cmds else f"/{cmd}" for cmd in _ADMIN_CMDS]
+    else:
+        everyone_cmds = [f"/{cmd}" for cmd in _EVERYONE_CMDS if cmd not in disabled_cmds]
+        admin_only_cmds = []
 
-        is_disabled = cmd in disabled_cmds
-        display_cmd = f"/{cmd}"
-        if is_disabled:
-            display_cmd += " (disabled)"
-
-        if info['is_admin']:
-            if is_admin_user:  # Admins see all admin commands
-                admin_only_cmds.append(display_cmd)
-        else:  # Everyone commands
-            if not is_disabled:
-                everyone_cmds.append(display_cmd)
-            elif is_admin_user:  # Admins also see disabled everyone commands
-                everyone_cmds.append(display_cmd)
-
-    # Dynamic hashtag commands (now for everyone)
+    # Dynamic hashtag commands saved in this group (now for everyone)
+    group_id_str = str(group_id)
     hashtag_data = load_hashtag_data()
-    for tag in sorted(hashtag_data.keys()):
-        everyone_cmds.append(f"/{tag}")
+    for tag, chats in hashtag_data.items():
+        if chats.get(group_id_str):
+            everyone_cmds.append(f"/{tag}")
 
     msg = '<b>Commands for everyone:</b>\n' + ('\n'.join(sorted(everyone_cmds)) if everyone_cmds else 'None')
     if is_admin_user:
         msg += '\n\n<b>Commands for admins only:</b>\n' + ('\n'.join(sorted(admin_only_cmds)) if admin_only_cmds else 'None')
 
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=msg, parse_mode='HTML')
+    sent_message = await _reply(update, text=msg, parse_mode='HTML')
     await schedule_message_deletion(context, sent_message)
 
 # Persistent storage for disabled commands per group
 DISABLED_COMMANDS_FILE = BASE_DIR / 'disabled_commands.json'
 
 def load_disabled_commands():
-    if os.path.exists(DISABLED_COMMANDS_FILE):
-        with open(DISABLED_COMMANDS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    return _load_cached(DISABLED_COMMANDS_FILE, _read_disabled_commands)
+
+def _read_disabled_commands():
+    """Read disabled commands as {group_id: set of command names}; the file stores sorted lists."""
+    # get_disabled_commands memoizes sets derived from this data, so drop them on every (re)load
+    _disabled_commands_memo.cache_clear()
+    _disabled_groups_memo.cache_clear()
+    return {group_id: set(commands) for group_id, commands in _read_chat_keyed_json(DISABLED_COMMANDS_FILE).items()}
 
 def save_disabled_commands(data):
-    with open(DISABLED_COMMANDS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # JSON has no sets, so write each group's commands as a sorted list
+    _write_json_atomic(DISABLED_COMMANDS_FILE, {group_id: sorted(commands) for group_id, commands in data.items()})
+    _store_cached(DISABLED_COMMANDS_FILE, data)
+    _disabled_commands_memo.cache_clear()
+    _disabled_groups_memo.cache_clear()
+
+def get_disabled_commands(chat_id: int) -> frozenset:
+    """
+    Returns the commands disabled in a group as a frozenset.
+    Results are memoized; reloading or saving the disabled commands clears the memo.
+    """
+    load_disabled_commands()
+    return _disabled_commands_memo(chat_id)
+
+@lru_cache(maxsize=1024)
+def _disabled_commands_memo(chat_id: int) -> frozenset:
+    return frozenset(load_disabled_commands().get(chat_id, ()))
+
+def get_groups_with_command_disabled(command_name: str) -> frozenset:
+    """
+    Returns the ids (as strings, like get_all_group_ids) of every group that disabled a command.
+    Lets callers filter a batch of groups with one set difference.
+    """
+    load_disabled_commands()
+    return _disabled_groups_memo(command_name)
+
+@lru_cache(maxsize=64)
+def _disabled_groups_memo(command_name: str) -> frozenset:
+    return frozenset(str(chat_id) for chat_id, commands in load_disabled_commands().items() if command_name in commands)
+
+def is_command_disabled(chat_id: int, command_name: str) -> bool:
+    """Check whether a command is disabled in the given group."""
+    return command_name in get_disabled_commands(chat_id)
 
 # /disable - Remove a dynamic hashtag command or disable a static command (admin only)
 @command_handler_wrapper(admin_only=True)
 async def disable_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Update user activity for inactivity tracking
-    if update.effective_user and update.effective_chat and update.effective_chat.type in ["group", "supergroup"]:
-        update_user_activity(update.effective_user.id, update.effective_chat.id)
+    update_user_activity(update.effective_user, update.effective_chat)
     if update.effective_chat.type == "private":
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="This command can only be used in group chats.")
+        sent_message = await _reply(update, text="This command can only be used in group chats.")
         await schedule_message_deletion(context, sent_message)
         return
     if not update.message or not context.args:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Usage: /disable <command or hashtag>")
+        sent_message = await _reply(update, text="Usage: /disable <command or hashtag>")
         await schedule_message_deletion(context, sent_message)
         return
     tag = context.args[0].lstrip('#/').lower()
@@ -2291,25 +2944,25 @@ async def disable_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Dynamic command removal
     if tag in data:
         del data[tag]
-        save_hashtag_data(data)
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Dynamic command /{tag} has been disabled.")
+        await save_hashtag_data(data)
+        sent_message = await _reply(update, text=f"Dynamic command /{tag} has been disabled.")
         await schedule_message_deletion(context, sent_message)
         return
     # Static command disabling
     if tag in COMMAND_MAP:
-        group_id = str(update.effective_chat.id)
+        group_id = update.effective_chat.id
         disabled = load_disabled_commands()
-        disabled.setdefault(group_id, [])
-        if tag not in disabled[group_id]:
-            disabled[group_id].append(tag)
+        group_disabled = disabled.setdefault(group_id, set())
+        if tag not in group_disabled:
+            group_disabled.add(tag)
             save_disabled_commands(disabled)
-            sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Command /{tag} has been disabled in this group. Admins can re-enable it with /enable {tag}.")
+            sent_message = await _reply(update, text=f"Command /{tag} has been disabled in this group. Admins can re-enable it with /enable {tag}.")
             await schedule_message_deletion(context, sent_message)
         else:
-            sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Command /{tag} is already disabled.")
+            sent_message = await _reply(update, text=f"Command /{tag} is already disabled.")
             await schedule_message_deletion(context, sent_message)
         return
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"No such dynamic or static command: /{tag}")
+    sent_message = await _reply(update, text=f"No such dynamic or static command: /{tag}")
     await schedule_message_deletion(context, sent_message)
 
 @command_handler_wrapper(admin_only=True)
@@ -2318,27 +2971,27 @@ async def enable_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     /enable <command> (admin only): Enables a previously disabled command in the group.
     """
     if update.effective_chat.type not in ["group", "supergroup"]:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="This command can only be used in group chats.")
+        sent_message = await _reply(update, text="This command can only be used in group chats.")
         await schedule_message_deletion(context, sent_message)
         return
     if not context.args:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Usage: /enable <command>")
+        sent_message = await _reply(update, text="Usage: /enable <command>")
         await schedule_message_deletion(context, sent_message)
         return
 
     command_to_enable = context.args[0].lstrip('/').lower()
-    group_id = str(update.effective_chat.id)
+    group_id = update.effective_chat.id
     disabled = load_disabled_commands()
 
-    if group_id in disabled and command_to_enable in disabled[group_id]:
-        disabled[group_id].remove(command_to_enable)
-        if not disabled[group_id]:  # Remove group key if list is empty
+    if command_to_enable in disabled.get(group_id, ()):
+        disabled[group_id].discard(command_to_enable)
+        if not disabled[group_id]:  # Remove group key if set is empty
             del disabled[group_id]
         save_disabled_commands(disabled)
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Command /{command_to_enable} has been enabled in this group.")
+        sent_message = await _reply(update, text=f"Command /{command_to_enable} has been enabled in this group.")
         await schedule_message_deletion(context, sent_message)
     else:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Command /{command_to_enable} is not currently disabled.")
+        sent_message = await _reply(update, text=f"Command /{command_to_enable} is not currently disabled.")
         await schedule_message_deletion(context, sent_message)
 
 @command_handler_wrapper(admin_only=True)
@@ -2349,50 +3002,48 @@ async def timer_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     chat = update.effective_chat
     if chat.type not in ['group', 'supergroup']:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="This command can only be used in a group chat.")
+        sent_message = await _reply(update, text="This command can only be used in a group chat.")
         await schedule_message_deletion(context, sent_message)
         return
 
     if not context.args:
         settings = load_timer_settings()
-        group_id_str = str(chat.id)
-        current_timer = settings.get(group_id_str, 0)
+        current_timer = settings.get(chat.id, 0)
         if current_timer > 0:
-            sent_message = await context.bot.send_message(chat_id=chat.id, text=f"The current message deletion timer is set to {current_timer} minutes. Use `/timer <minutes>` to change it, or `/timer 0` to disable.")
+            sent_message = await _reply(update, text=f"The current message deletion timer is set to {current_timer} minutes. Use `/timer <minutes>` to change it, or `/timer 0` to disable.")
             await schedule_message_deletion(context, sent_message)
         else:
-            sent_message = await context.bot.send_message(chat_id=chat.id, text="There is no message deletion timer set for this group. Use `/timer <minutes>` to set one.")
+            sent_message = await _reply(update, text="There is no message deletion timer set for this group. Use `/timer <minutes>` to set one.")
             await schedule_message_deletion(context, sent_message)
         return
 
     try:
         minutes = int(context.args[0])
     except ValueError:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="Invalid time. Please provide a number of minutes.")
+        sent_message = await _reply(update, text="Invalid time. Please provide a number of minutes.")
         await schedule_message_deletion(context, sent_message)
         return
 
     if minutes < 0:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="Time must be a positive number of minutes.")
+        sent_message = await _reply(update, text="Time must be a positive number of minutes.")
         await schedule_message_deletion(context, sent_message)
         return
 
     settings = load_timer_settings()
-    group_id_str = str(chat.id)
 
     if minutes == 0:
-        if group_id_str in settings:
-            del settings[group_id_str]
+        if chat.id in settings:
+            del settings[chat.id]
             save_timer_settings(settings)
-            sent_message = await context.bot.send_message(chat_id=chat.id, text="Message deletion timer has been disabled for this group.")
+            sent_message = await _reply(update, text="Message deletion timer has been disabled for this group.")
             await schedule_message_deletion(context, sent_message)
         else:
-            sent_message = await context.bot.send_message(chat_id=chat.id, text="Message deletion timer is already disabled.")
+            sent_message = await _reply(update, text="Message deletion timer is already disabled.")
             await schedule_message_deletion(context, sent_message)
     else:
-        settings[group_id_str] = minutes
+        settings[chat.id] = minutes
         save_timer_settings(settings)
-        sent_message = await context.bot.send_message(chat_id=chat.id, text=f"Bot messages in this group will now be deleted after {minutes} minute(s).")
+        sent_message = await _reply(update, text=f"Bot messages in this group will now be deleted after {minutes} minute(s).")
         await schedule_message_deletion(context, sent_message)
 
 @command_handler_wrapper(admin_only=True)
@@ -2403,36 +3054,29 @@ async def notimer_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """
     message = update.message
     if not message.reply_to_message:
-        sent_message = await context.bot.send_message(chat_id=message.chat.id, text="Please use this command by replying to the message you want to keep.")
+        sent_message = await _reply(update, text="Please use this command by replying to the message you want to keep.")
         await schedule_message_deletion(context, sent_message)
         return
 
     # Check if the replied-to message is from this bot
     if not message.reply_to_message.from_user.id == context.bot.id:
-        sent_message = await context.bot.send_message(chat_id=message.chat.id, text="This command only works on messages sent by me.")
+        sent_message = await _reply(update, text="This command only works on messages sent by me.")
         await schedule_message_deletion(context, sent_message)
         return
 
     replied_message = message.reply_to_message
     chat_id = replied_message.chat.id
     message_id = replied_message.message_id
-    job_name = f"delete_{chat_id}_{message_id}"
-
-    # Find and remove the scheduled job
-    jobs = context.job_queue.get_jobs_by_name(job_name)
-    if jobs:
-        for job in jobs:
-            job.schedule_removal()
-        logger.info(f"Removed deletion job {job_name} for message {message_id} in chat {chat_id}.")
-        # Also save to the no_delete_ids file as a fallback
-        no_delete_ids = load_no_delete_ids()
-        no_delete_ids.append({'chat_id': chat_id, 'message_id': message_id})
-        save_no_delete_ids(no_delete_ids)
+
+    # Cancel the pending deletion; the sweeper skips entries no longer in the scheduled set
+    if (chat_id, message_id) in _SCHEDULED_DELETIONS:
+        _SCHEDULED_DELETIONS.discard((chat_id, message_id))
+        logger.info(f"Cancelled scheduled deletion of message {message_id} in chat {chat_id}.")
         sent_message = await context.bot.send_message(chat_id=chat_id, text="Okay, I will not delete that message.")
         await schedule_message_deletion(context, sent_message)
     else:
-        # If no job was found, it might have already been deleted or was never scheduled.
-        # Still, we can add it to the no_delete list just in case the job is about to run.
+        # If nothing was pending, it might have already been deleted or was never scheduled.
+        # Still, we can add it to the no_delete list just in case a sweep is about to run.
         no_delete_ids = load_no_delete_ids()
         # Avoid adding duplicates
         if not any(d['message_id'] == message_id for d in no_delete_ids):
@@ -2451,18 +3095,17 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat = update.effective_chat
 
     if chat.type not in ['group', 'supergroup']:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="This command can only be used in group chats.")
+        sent_message = await _reply(update, text="This command can only be used in group chats.")
         await schedule_message_deletion(context, sent_message)
         return
 
     if not message.reply_to_message:
-        sent_message = await context.bot.send_message(chat_id=chat.id, text="Please use this command as a reply to the message you want to report.")
+        sent_message = await _reply(update, text="Please use this command as a reply to the message you want to report.")
         await schedule_message_deletion(context, sent_message)
         return
 
     # Update user activity
-    if update.effective_user:
-        update_user_activity(update.effective_user.id, chat.id)
+    update_user_activity(update.effective_user, chat)
 
     # Prepare the report
     reporting_user = update.effective_user
@@ -2474,8 +3117,8 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     reporting_user_display = get_display_name(reporting_user.id, reporting_user.full_name)
     reported_user_display = get_display_name(reported_user.id, reported_user.full_name)
 
-    # Create a link to the message
-    message_link = f"https://t.me/c/{str(chat.id).replace('-100', '')}/{reported_message.message_id}"
+    # Create a link to the message; t.me/c/ links use the supergroup id without its -100 prefix
+    message_link = f"https://t.me/c/{str(chat.id).removeprefix('-100')}/{reported_message.message_id}"
 
     report_text = (
         f"🚨 <b>Admin Report</b> 🚨\n\n"
@@ -2487,12 +3130,9 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
     # Notify admins
-    admins = await context.bot.get_chat_administrators(chat.id)
-    notification_sent = False
-    for admin in admins:
-        # Don't notify the bot itself if it's an admin
-        if admin.user.is_bot:
-            continue
+    admins = await get_chat_administrators_cached(context.bot, chat.id)
+
+    async def notify_admin(admin) -> bool:
         try:
             # Forward the original message first
             await context.bot.forward_message(
@@ -2508,16 +3148,21 @@ async def admin_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 disable_web_page_preview=True
             )
             await schedule_message_deletion(context, sent_message)
-            notification_sent = True
+            return True
         except Exception as e:
             logger.warning(f"Failed to notify admin {admin.user.id} for report in group {chat.id}: {e}")
+            return False
 
-    if notification_sent:
+    # Notify all admins concurrently; each admin still gets the forward before the report.
+    # Don't notify the bot itself if it's an admin.
+    results = await asyncio.gather(*(notify_admin(admin) for admin in admins if not admin.user.is_bot))
+
+    if any(results):
         # Confirm to the user that the report was sent
-        sent_message = await context.bot.send_message(chat_id=message.chat.id, text="The admins have been notified.")
+        sent_message = await _reply(update, text="The admins have been notified.")
         await schedule_message_deletion(context, sent_message)
     else:
-        sent_message = await context.bot.send_message(chat_id=message.chat.id, text="Could not notify any admins. Please ensure the bot has the correct permissions.")
+        sent_message = await _reply(update, text="Could not notify any admins. Please ensure the bot has the correct permissions.")
         await schedule_message_deletion(context, sent_message)
 
 
@@ -2530,7 +3175,7 @@ async def link_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
 
     if chat.type == 'private':
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="This command is used to generate an invite link for a group. Please run this command inside the group you want the link for.")
+        sent_message = await _reply(update, text="This command is used to generate an invite link for a group. Please run this command inside the group you want the link for.")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -2551,16 +3196,16 @@ async def link_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 )
                 await schedule_message_deletion(context, sent_message)
                 # Confirm in the group chat
-                sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="I have sent you a single-use invite link in a private message.")
+                sent_message = await _reply(update, text="I have sent you a single-use invite link in a private message.")
                 await schedule_message_deletion(context, sent_message)
             except Exception as e:
                 logger.error(f"Failed to send private message to admin {user.id}: {e}")
-                sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="I couldn't send you a private message. Please make sure you have started a chat with me privately first.")
+                sent_message = await _reply(update, text="I couldn't send you a private message. Please make sure you have started a chat with me privately first.")
                 await schedule_message_deletion(context, sent_message)
 
         except Exception as e:
             logger.error(f"Failed to create invite link for chat {chat.id}: {e}")
-            sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="I was unable to create an invite link. Please ensure I have the 'Invite Users via Link' permission in this group.")
+            sent_message = await _reply(update, text="I was unable to create an invite link. Please ensure I have the 'Invite Users via Link' permission in this group.")
             await schedule_message_deletion(context, sent_message)
 
 
@@ -2575,8 +3220,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat = update.effective_chat
 
     # Update user activity in groups
-    if user and chat and chat.type in ["group", "supergroup"]:
-        update_user_activity(user.id, chat.id)
+    update_user_activity(user, chat)
 
     # Define the detailed private start message
     private_start_message = """
@@ -2600,7 +3244,7 @@ If you encounter any bugs or have ideas for new features, please contact my crea
     else:
         # In a group chat, send a prompt and try to message the user privately
         group_start_message = f"Hey {user.mention_html()}! Please message me in private to get started."
-        sent_message = await context.bot.send_message(chat_id=chat.id, text=group_start_message, parse_mode='HTML')
+        sent_message = await _reply(update, text=group_start_message, parse_mode='HTML')
         await schedule_message_deletion(context, sent_message)
         try:
             sent_message = await context.bot.send_message(
@@ -2619,7 +3263,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Shows the interactive help menu.
     """
     if update.effective_chat.type != "private":
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Please use the /help command in a private chat with me for a better experience.")
+        sent_message = await _reply(update, text="Please use the /help command in a private chat with me for a better experience.")
         await schedule_message_deletion(context, sent_message)
         return
 
@@ -2641,19 +3285,8 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await schedule_message_deletion(context, sent_message)
 
 
-async def help_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handles all interactions with the interactive help menu."""
-    query = update.callback_query
-    await query.answer()
-
-    user_id = query.from_user.id
-    topic = query.data
-
-    text = ""
-    keyboard = [[InlineKeyboardButton("« Back to Main Menu", callback_data='help_back')]]
-
-    if topic == 'help_general':
-        text = """
+# Static bodies of the help menu sections, built once at import
+_HELP_GENERAL_TEXT = """
 <b>General Commands</b>
 - /help: Shows this help menu.
 - /command: Lists all available commands in the current group.
@@ -2665,12 +3298,8 @@ async def help_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 - /random: Submit up to 4 media items to the random pool for future posts. (Private chat only)
 - /cancel: Cancels an ongoing operation like /risk or /post.
         """
-    elif topic == 'help_admin':
-        if not is_admin(user_id):
-            await query.answer("You are not authorized to view this section.", show_alert=True)
-            return
 
-        text = """
+_HELP_ADMIN_TEXT = """
 <b>Administrator Commands</b>
 
 <u>Content & User Management</u>
@@ -2698,12 +3327,39 @@ async def help_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 - /listconditions: Lists all current purge conditions with their IDs.
 - /removecondition &lt;id&gt;: Removes a purge condition by its ID.
 """
+
+@lru_cache(maxsize=1)
+def _format_hashtag_help(tags: tuple) -> str:
+    """Renders the admin help's hashtag command section; rebuilt only when the tag list changes."""
+    return (
+        "\n<b>Dynamic Hashtag Commands (Admin-only):</b>\n"
+        + '\n'.join(f"/{tag}" for tag in tags)
+        + "\n<i>These are created by posting with a hashtag and can be removed with /disable.</i>"
+    )
+
+async def help_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handles all interactions with the interactive help menu."""
+    query = update.callback_query
+    await query.answer()
+
+    user_id = query.from_user.id
+    topic = query.data
+
+    text = ""
+    keyboard = [[InlineKeyboardButton("« Back to Main Menu", callback_data='help_back')]]
+
+    if topic == 'help_general':
+        text = _HELP_GENERAL_TEXT
+    elif topic == 'help_admin':
+        if not is_admin(user_id):
+            await query.answer("You are not authorized to view this section.", show_alert=True)
+            return
+
+        text = _HELP_ADMIN_TEXT
         # Append dynamic hashtag commands if they exist
         hashtag_data = load_hashtag_data()
         if hashtag_data:
-            text += "\n<b>Dynamic Hashtag Commands (Admin-only):</b>\n"
-            text += '\n'.join(f"/{tag}" for tag in sorted(hashtag_data.keys()))
-            text += "\n<i>These are created by posting with a hashtag and can be removed with /disable.</i>"
+            text += _format_hashtag_help(get_sorted_hashtags())
 
     elif topic == 'help_back':
         main_menu_keyboard = [
@@ -2724,22 +3380,22 @@ async def help_menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 @command_handler_wrapper(admin_only=False)
 async def beowned_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Update user activity for inactivity tracking
-    if update.effective_user and update.effective_chat and update.effective_chat.type in ["group", "supergroup"]:
-        update_user_activity(update.effective_user.id, update.effective_chat.id)
-    # Check if disabled in this group
-    if update.effective_chat.type != "private":
-        group_id = str(update.effective_chat.id)
-        disabled = load_disabled_commands()
-        if 'beowned' in disabled.get(group_id, []):
-            return
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="If you want to be Lion's property, contact @Lionspridechatbot with a head to toe nude picture of yourself and a clear, concise and complete presentation of yourself.")
+    update_user_activity(update.effective_user, update.effective_chat)
+    # command_handler_wrapper has already dropped the command if it is disabled in this group
+    sent_message = await _reply(update, text="If you want to be Lion's property, contact @Lionspridechatbot with a head to toe nude picture of yourself and a clear, concise and complete presentation of yourself.")
     await schedule_message_deletion(context, sent_message)
 
 #Responses
+# Keyword -> reply; the keywords are matched anywhere in the text, ignoring case
+_RESPONSES = {
+    'dog': 'Is @Luke082 here? Someone should use his command (/luke8)!',
+}
+_RESPONSE_RE = re.compile('|'.join(map(re.escape, _RESPONSES)), re.IGNORECASE)
+
 def handle_response(text: str) -> str:
-    processed: str = text.lower()
-    if 'dog' in processed:
-        return 'Is @Luke082 here? Someone should use his command (/luke8)!'
+    match = _RESPONSE_RE.search(text)
+    if match:
+        return _RESPONSES[match.group(0).lower()]
 
 async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     message = update.message or update.edited_message
@@ -2747,8 +3403,7 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     # Update user activity for inactivity tracking
-    if message.from_user and message.chat and message.chat.type in ["group", "supergroup"]:
-        update_user_activity(message.from_user.id, message.chat.id)
+    update_user_activity(message.from_user, message.chat)
     if message.text:
         response = handle_response(message.text)
         if response:
@@ -2756,86 +3411,95 @@ async def message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await schedule_message_deletion(context, sent_message)
 
 import html
-import traceback
+
+ERROR_PAYLOAD_LIMIT = 2000  # Max characters of each part of an error report
 
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Log the error and send a telegram message to notify the developer."""
     # Log the error before we do anything else, so we can see it even if something breaks.
     logger.error("Exception while handling an update:", exc_info=context.error)
 
-    # traceback.format_exception returns the usual python message about an exception, but as a
-    # list of strings rather than a single string, so we have to join them together.
-    tb_list = traceback.format_exception(None, context.error, context.error.__traceback__)
-    tb_string = "".join(tb_list)
-
-    # Build the message with some markup and additional information about what happened.
-    # You might need to add some logic to deal with messages longer than the 4096 character limit.
-    update_str = update.to_dict() if isinstance(update, Update) else str(update)
-    message = (
-        f"An exception was raised while handling an update\n"
-        f"<pre>update = {html.escape(json.dumps(update_str, indent=2, ensure_ascii=False))}</pre>\n\n"
-        f"<pre>context.chat_data = {html.escape(str(context.chat_data))}</pre>\n\n"
-        f"<pre>context.user_data = {html.escape(str(context.user_data))}</pre>\n\n"
-        f"<pre>{html.escape(tb_string)}</pre>"
-    )
-
-    logger.error(message)
-
+    # The full traceback is already in the record above. The update and conversation data
+    # only help when debugging, so skip serializing them otherwise; error storms then cost
+    # one log record each. Each part is capped so a huge update (e.g. a media group) can't
+    # turn an error into a multi-MB string build.
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    try:
+        update_str = json.dumps(update.to_dict(), ensure_ascii=False) if isinstance(update, Update) else str(update)
+        logger.debug(
+            "Error context:\nupdate = %s\ncontext.chat_data = %s\ncontext.user_data = %s",
+            update_str[:ERROR_PAYLOAD_LIMIT],
+            str(context.chat_data)[:ERROR_PAYLOAD_LIMIT],
+            str(context.user_data)[:ERROR_PAYLOAD_LIMIT],
+        )
+    except Exception as e:
+        logger.error(f"Failed to build error report: {e}")
 
 
 # =============================
 # Timed Message Deletion
 # =============================
+# Pending timed deletions as a (due_timestamp, chat_id, message_id) min-heap, drained by one
+# repeating sweep job instead of a separate job_queue entry per message.
+_PENDING_DELETIONS = []
+# (chat_id, message_id) pairs still due for deletion; /notimer cancels by removing from here.
+_SCHEDULED_DELETIONS = set()
+DELETION_SWEEP_INTERVAL = 5  # seconds
+
 async def schedule_message_deletion(context: ContextTypes.DEFAULT_TYPE, message: Message):
     """
     Schedules a message for deletion if a timer is set for the group.
     """
-    chat_id = message.chat_id
-    if chat_id < 0:  # Only apply timers in groups
-        timer_settings = load_timer_settings()
-        group_id_str = str(chat_id)
-        timer_minutes = timer_settings.get(group_id_str)
-
-        if timer_minutes and timer_minutes > 0:
-            message_id = message.message_id
-            job_name = f"delete_{chat_id}_{message_id}"
-            context.job_queue.run_once(
-                delete_message_callback,
-                when=timer_minutes * 60,
-                chat_id=chat_id,
-                data={'message_id': message_id},
-                name=job_name
-            )
-            logger.debug(f"Scheduled message {message_id} in chat {chat_id} for deletion in {timer_minutes} minutes. Job: {job_name}")
-
-async def delete_message_callback(context: CallbackContext):
-    """Deletes the message specified in the job context if it's not marked for no-deletion."""
-    job_data = context.job.data
-    chat_id = context.job.chat_id
-    message_id = job_data['message_id']
+    _schedule_deletion(message.chat_id, message.message_id)
 
-    no_delete_ids = load_no_delete_ids()
+def _schedule_deletion(chat_id: int, message_id: int):
+    """Schedules a message by id, for API calls such as copy_message that return no Message."""
+    # Only groups can have timers, so private chats never touch the settings
+    if chat_id >= 0:
+        return
+    timer_minutes = load_timer_settings().get(chat_id)
+    if not timer_minutes or timer_minutes <= 0:
+        return
 
-    message_to_keep = None
-    for item in no_delete_ids:
-        if item.get('chat_id') == chat_id and item.get('message_id') == message_id:
-            message_to_keep = item
-            break
+    heapq.heappush(_PENDING_DELETIONS, (time.time() + timer_minutes * 60, chat_id, message_id))
+    _SCHEDULED_DELETIONS.add((chat_id, message_id))
+    logger.debug(f"Scheduled message {message_id} in chat {chat_id} for deletion in {timer_minutes} minutes.")
 
+async def _delete_scheduled_message(bot, chat_id: int, message_id: int):
     try:
-        if message_to_keep:
-            logger.info(f"Deletion cancelled for message {message_id} in chat {chat_id} due to /notimer command.")
-            return
-
-        await context.bot.delete_message(chat_id=chat_id, message_id=message_id)
+        await bot.delete_message(chat_id=chat_id, message_id=message_id)
         logger.debug(f"Deleted scheduled message {message_id} in chat {chat_id}")
     except Exception as e:
         logger.warning(f"Failed to delete scheduled message {message_id} in chat {chat_id}: {e}")
-    finally:
-        # Always try to remove the ID from the list after the job is processed.
-        if message_to_keep:
-            no_delete_ids.remove(message_to_keep)
-            save_no_delete_ids(no_delete_ids)
+
+async def sweep_scheduled_deletions(context: CallbackContext):
+    """Deletes every scheduled message whose timer has expired, skipping ones marked with /notimer."""
+    now = time.time()
+    due = []
+    while _PENDING_DELETIONS and _PENDING_DELETIONS[0][0] <= now:
+        _, chat_id, message_id = heapq.heappop(_PENDING_DELETIONS)
+        key = (chat_id, message_id)
+        if key in _SCHEDULED_DELETIONS:
+            _SCHEDULED_DELETIONS.discard(key)
+            due.append(key)
+    if not due:
+        return
+
+    no_delete_ids = load_no_delete_ids()
+    keep = {(item.get('chat_id'), item.get('message_id')) for item in no_delete_ids}
+    kept = keep.intersection(due)
+    for chat_id, message_id in kept:
+        logger.info(f"Deletion cancelled for message {message_id} in chat {chat_id} due to /notimer command.")
+
+    await asyncio.gather(*(
+        _delete_scheduled_message(context.bot, chat_id, message_id)
+        for chat_id, message_id in due if (chat_id, message_id) not in kept
+    ))
+
+    if kept:
+        # The no-delete marker has served its purpose once the deletion is skipped.
+        save_no_delete_ids([item for item in no_delete_ids if (item.get('chat_id'), item.get('message_id')) not in kept])
 
 
 # =============================
@@ -2849,30 +3513,30 @@ async def inactive_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     - /inactive <n> (1-99) enables auto-kick for users inactive for n days.
     """
     if update.effective_chat.type not in ["group", "supergroup"]:
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="This command can only be used in group chats.")
+        sent_message = await _reply(update, text="This command can only be used in group chats.")
         await schedule_message_deletion(context, sent_message)
         return
     if not context.args or not context.args[0].strip().isdigit():
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Usage: /inactive <days> (0 to disable, 1-99 to enable)")
+        sent_message = await _reply(update, text="Usage: /inactive <days> (0 to disable, 1-99 to enable)")
         await schedule_message_deletion(context, sent_message)
         return
     days = int(context.args[0].strip())
-    group_id = str(update.effective_chat.id)
+    group_id = update.effective_chat.id
     settings = load_inactive_settings()
     if days == 0:
         settings.pop(group_id, None)
         save_inactive_settings(settings)
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Inactive user kicking is now disabled in this group.")
+        sent_message = await _reply(update, text="Inactive user kicking is now disabled in this group.")
         await schedule_message_deletion(context, sent_message)
         logger.debug(f"Inactive kicking disabled for group {group_id}")
         return
     if not (1 <= days <= 99):
-        sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text="Please provide a number of days between 1 and 99.")
+        sent_message = await _reply(update, text="Please provide a number of days between 1 and 99.")
         await schedule_message_deletion(context, sent_message)
         return
     settings[group_id] = days
     save_inactive_settings(settings)
-    sent_message = await context.bot.send_message(chat_id=update.effective_chat.id, text=f"Inactive user kicking is now enabled for this group. Users inactive for {days} days will be kicked.")
+    sent_message = await _reply(update, text=f"Inactive user kicking is now enabled for this group. Users inactive for {days} days will be kicked.")
     await schedule_message_deletion(context, sent_message)
     logger.debug(f"Inactive kicking enabled for group {group_id} with threshold {days} days")
 
@@ -2884,9 +3548,11 @@ async def periodic_random_risk_check(context: ContextTypes.DEFAULT_TYPE):
     logger.debug("Running periodic random risk check...")
     settings = load_random_risk_settings()
 
-    for group_id_str, percentage in settings.items():
+    for group_id, percentage in settings.items():
         if not (isinstance(percentage, (int, float)) and 0 < percentage <= 100):
             continue
+        # Risks store their group id as a string, so convert once per group
+        group_id_str = str(group_id)
 
         # Roll the dice
         if random.random() * 100 < percentage:
@@ -2894,37 +3560,31 @@ async def periodic_random_risk_check(context: ContextTypes.DEFAULT_TYPE):
             try:
                 risk_data = load_risk_data()
 
+                # Collect (user_id, risk) pairs rather than tagging the risks themselves,
+                # since risk_data is the shared in-memory snapshot.
                 group_risks = []
                 for user_id, risks in risk_data.items():
                     for risk in risks:
                         if str(risk.get('group_id')) == group_id_str and not risk.get('purged', False):
-                            risk['user_id'] = user_id
-                            group_risks.append(risk)
+                            group_risks.append((user_id, risk))
 
                 if not group_risks:
                     logger.info(f"Random risk check for group {group_id_str} passed, but no risks were found for this group.")
                     continue
 
-                target_risk = random.choice(group_risks)
+                target_user_id, target_risk = random.choice(group_risks)
 
                 try:
-                    user = await context.bot.get_chat(int(target_risk['user_id']))
+                    user = await context.bot.get_chat(int(target_user_id))
                     user_mention = user.mention_html()
                 except Exception:
-                    user_mention = f"user {target_risk['user_id']}"
+                    user_mention = f"user {target_user_id}"
 
                 caption = f"I feel mean, so lets see what {user_mention} sent me 😂"
 
                 media_type = target_risk['media_type']
                 file_id = target_risk['file_id']
-                sent_message = None
-
-                if media_type == 'photo':
-                    sent_message = await context.bot.send_photo(group_id_str, file_id, caption=caption, parse_mode='HTML')
-                elif media_type == 'video':
-                    sent_message = await context.bot.send_video(group_id_str, file_id, caption=caption, parse_mode='HTML')
-                elif media_type == 'voice':
-                    sent_message = await context.bot.send_voice(group_id_str, file_id, caption=caption, parse_mode='HTML')
+                sent_message = await send_media(context.bot, group_id, media_type, file_id, caption=caption, parse_mode='HTML')
 
                 if sent_message:
                     await schedule_message_deletion(context, sent_message)
@@ -2944,49 +3604,144 @@ async def check_and_kick_inactive_users(app):
     settings = load_inactive_settings()
     activity = load_activity_data()
     now = int(time.time())
-    for group_id, days in settings.items():
+    bot = app.bot
+    # Bound concurrent ban/unban calls so large sweeps stay within Telegram's rate limits
+    semaphore = asyncio.Semaphore(10)
+
+    async def kick_user(group_id, user_id):
+        async with semaphore:
+            try:
+                await bot.ban_chat_member(group_id, user_id)
+                await bot.unban_chat_member(group_id, user_id, only_if_banned=True)  # Unban to allow rejoining
+                logger.debug("Kicked inactive user %s from group %s", user_id, group_id)
+            except Exception as e:
+                logger.error(f"Failed to kick user {user_id} from group {group_id}: {e}")
+
+    async def process_group(group_id, days):
         group_activity = activity.get(group_id, {})
         threshold = now - days * 86400
+        stale_ids = [user_id for user_id, last_active in group_activity.items() if last_active < threshold]
+        if not stale_ids:
+            return  # Nobody to kick, so skip the admin lookup entirely
         try:
-            bot = app.bot
-            admins = await bot.get_chat_administrators(int(group_id))
-            admin_ids = {str(admin.user.id) for admin in admins}
-            members = list(group_activity.keys())
-            for user_id in members:
-                if user_id in admin_ids:
-                    continue  # Never kick admins
-                last_active = group_activity.get(user_id, 0)
-                if last_active < threshold:
-                    try:
-                        await bot.ban_chat_member(int(group_id), int(user_id))
-                        await bot.unban_chat_member(int(group_id), int(user_id))  # Unban to allow rejoining
-                        print(f"[DEBUG] Kicked inactive user {user_id} from group {group_id}")
-                    except Exception as e:
-                        logger.error(f"Failed to kick user {user_id} from group {group_id}: {e}")
+            admin_ids = await get_group_admin_ids(bot, group_id)
+            # Never kick admins
+            await asyncio.gather(*(kick_user(group_id, user_id) for user_id in stale_ids if user_id not in admin_ids))
         except Exception as e:
             logger.error(f"Failed to process group {group_id} for inactivity kicking: {e}")
 
+    await asyncio.gather(*(process_group(group_id, days) for group_id, days in list(settings.items())))
+
+# =============================
+# Startup
+# =============================
+async def preload_data_caches():
+    """
+    Reads every cached data file once at startup, in worker threads and concurrently,
+    so the first updates are answered from memory instead of paying for the disk reads.
+    """
+    loaders = (
+        load_admin_data, load_admin_nicknames, load_hashtag_data, load_activity_data,
+        load_inactive_settings, load_risk_data, load_disabled_commands,
+        load_timer_settings, load_random_risk_settings, load_conditions_data,
+    )
+    results = await asyncio.gather(*(asyncio.to_thread(loader) for loader in loaders), return_exceptions=True)
+    for loader, result in zip(loaders, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to preload data with {loader.__name__}: {result}")
+
+# =============================
+# Callback Query Patterns
+# =============================
+# Compiled once at import and shared by the CallbackQueryHandlers registered below.
+_RISK_GROUP_RE = re.compile('^risk_group_')
+_RISK_DONE_SENDING_RE = re.compile('^risk_done_sending$')
+_RISK_SAVE_CONSENT_RE = re.compile('^risk_save_consent_')
+_BEG_POST_RE = re.compile('^beg_post_')
+_POST_GROUP_RE = re.compile('^post_group_')
+_POST_CONFIRM_RE = re.compile('^post_confirm$|^post_cancel$')
+_PURGE_CONFIRM_RE = re.compile('^purge_confirm$|^purge_cancel$')
+_RANDOM_ADMIN_RE = re.compile('^random_admin_')
+_RANDOM_DONE_SENDING_RE = re.compile('^random_done_sending$')
+_HELP_RE = re.compile(r'^help_')
+_POSTRISK_RE = re.compile(r'^postrisk_')
+_POSTTAUNT_RE = re.compile(r'^posttaunt_')
+_PURGENOW_RE = re.compile(r'^purgenow_')
+_PURGE_RISK_CONFIRM_RE = re.compile(r'^purge(confirm|cancel)_')
+_PURGE_VERIFY_RE = re.compile(r'^purge_verify_')
+
+def split_risk_callback_data(data: str):
+    """
+    Splits "<action>_<user_id>_<risk_id>" callback data into its three parts,
+    raising ValueError if any part is missing.
+    """
+    action, _, rest = data.partition('_')
+    user_id, _, risk_id = rest.partition('_')
+    if not (action and user_id and risk_id):
+        raise ValueError(f"Malformed risk callback data: {data!r}")
+    return action, user_id, risk_id
+
+# Last time each (user_id, callback_data) press was handled, to drop double-clicks
+_RECENT_CALLBACKS = {}
+CALLBACK_DEDUP_TTL = 5  # seconds
+
+def is_duplicate_callback(query) -> bool:
+    """
+    Returns True if the same user pressed the same button within CALLBACK_DEDUP_TTL seconds,
+    otherwise records the press and returns False.
+    """
+    now = time.monotonic()
+    key = (query.from_user.id, query.data)
+    if now - _RECENT_CALLBACKS.get(key, float('-inf')) < CALLBACK_DEDUP_TTL:
+        return True
+    # Forget expired presses once the table grows, so it stays small
+    if len(_RECENT_CALLBACKS) > 1024:
+        for stale_key in [k for k, t in _RECENT_CALLBACKS.items() if now - t >= CALLBACK_DEDUP_TTL]:
+            del _RECENT_CALLBACKS[stale_key]
+    _RECENT_CALLBACKS[key] = now
+    return False
+
 # =============================
 # Command Registration Helper
 # =============================
+# Handlers for the . and ! prefixed forms, keyed by command name. A single
+# dispatcher serves all of them instead of two regex handlers per command.
+_PREFIX_COMMANDS = {}
+# One anchored alternation of the registered names, rebuilt by add_command
+_PREFIX_COMMAND_RE = None
+
+
+class _PrefixCommandFilter(filters.MessageFilter):
+    """Matches .<command> and !<command> for registered commands only."""
+    def filter(self, message) -> bool:
+        return _PREFIX_COMMAND_RE.match(message.text or '') is not None
+
+
+async def prefix_command_dispatcher(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Routes a . or ! prefixed command to its handler, populating context.args."""
+    message = update.effective_message
+    match = _PREFIX_COMMAND_RE.match(message.text or '')
+    if not match:
+        return
+    if update.message and update.message.text:
+        context.args = update.message.text.split()[1:]
+    await _PREFIX_COMMANDS[match.group(1)](update, context)
+
+
 def add_command(app: Application, command: str, handler):
     """
     Registers a command with support for /, ., and ! prefixes.
     """
-    # Wrapper for MessageHandlers to populate context.args
-    async def message_handler_wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        if update.message and update.message.text:
-            context.args = update.message.text.split()[1:]
-        await handler(update, context)
-
-    # Register for /<command> - uses the original handler as it populates args automatically
+    global _PREFIX_COMMAND_RE
+    # The . and ! dispatcher is registered once, at the position of the first command
+    if not _PREFIX_COMMANDS:
+        app.add_handler(MessageHandler(_PrefixCommandFilter(), prefix_command_dispatcher))
+    _PREFIX_COMMANDS[command] = handler
+    _PREFIX_COMMAND_RE = re.compile(r'^[.!](' + '|'.join(map(re.escape, _PREFIX_COMMANDS)) + r')(?:\s|$)')
+
+    # Register for /<command> - the CommandHandler populates args automatically
     app.add_handler(CommandHandler(command, handler))
 
-    # Register for .<command> and !<command> - uses the wrapper
-    app.add_handler(MessageHandler(filters.Regex(rf'^\.{command}(\s|$)'), message_handler_wrapper))
-    app.add_handler(MessageHandler(filters.Regex(rf'^!{command}(\s|$)'), message_handler_wrapper))
-
-
 if __name__ == '__main__':
     logger.info('Starting Telegram Bot...')
     logger.debug(f'TOKEN value: {TOKEN}')
@@ -2995,10 +3750,19 @@ if __name__ == '__main__':
         await check_and_kick_inactive_users(context.application)
 
     async def on_startup(app):
+        await preload_data_caches()
         # Schedule the periodic job using the job queue (every hour)
         app.job_queue.run_repeating(periodic_inactive_check_job, interval=3600, first=10)
         # Schedule the new random risk job (every 30 minutes)
         app.job_queue.run_repeating(periodic_random_risk_check, interval=1800, first=10)
+        # Single sweeper for all timed message deletions
+        app.job_queue.run_repeating(sweep_scheduled_deletions, interval=DELETION_SWEEP_INTERVAL, first=DELETION_SWEEP_INTERVAL)
+        # Write-behind flush of in-memory activity data
+        app.job_queue.run_repeating(flush_activity_data_job, interval=ACTIVITY_FLUSH_INTERVAL, first=ACTIVITY_FLUSH_INTERVAL)
+        # Write-behind flush of in-memory risk data
+        app.job_queue.run_repeating(flush_risk_data_job, interval=RISK_FLUSH_INTERVAL, first=RISK_FLUSH_INTERVAL)
+        # Fold the hashtag log back into hashtag_data.json
+        app.job_queue.run_repeating(compact_hashtag_data_job, interval=HASHTAG_COMPACT_INTERVAL, first=HASHTAG_COMPACT_INTERVAL)
 
     job_queue = JobQueue()
     app = Application.builder().token(TOKEN).post_init(on_startup).job_queue(job_queue).build()
@@ -3008,13 +3772,13 @@ if __name__ == '__main__':
     risk_conv_handler = ConversationHandler(
         entry_points=[CommandHandler('risk', risk_command)],
         states={
-            SELECT_GROUP: [CallbackQueryHandler(select_group_callback, pattern='^risk_group_')],
+            SELECT_GROUP: [CallbackQueryHandler(select_group_callback, pattern=_RISK_GROUP_RE)],
             AWAIT_MEDIA: [
                 MessageHandler(filters.PHOTO | filters.VIDEO | filters.VOICE, receive_media_handler),
-                CallbackQueryHandler(done_sending_media_callback, pattern='^risk_done_sending$')
+                CallbackQueryHandler(done_sending_media_callback, pattern=_RISK_DONE_SENDING_RE)
             ],
-            AWAIT_SAVE_CONSENT: [CallbackQueryHandler(save_consent_callback, pattern='^risk_save_consent_')],
-            AWAIT_BEGGING: [CallbackQueryHandler(beg_callback_handler, pattern='^beg_post_')],
+            AWAIT_SAVE_CONSENT: [CallbackQueryHandler(save_consent_callback, pattern=_RISK_SAVE_CONSENT_RE)],
+            AWAIT_BEGGING: [CallbackQueryHandler(beg_callback_handler, pattern=_BEG_POST_RE)],
         },
         fallbacks=[CommandHandler('cancel', cancel_command)],
         per_message=False,
@@ -3026,10 +3790,12 @@ if __name__ == '__main__':
     post_conv_handler = ConversationHandler(
         entry_points=[CommandHandler('post', post_command)],
         states={
-            SELECT_POST_GROUP: [CallbackQueryHandler(select_post_group_callback, pattern='^post_group_')],
+            SELECT_POST_GROUP: [CallbackQueryHandler(select_post_group_callback, pattern=_POST_GROUP_RE)],
             AWAIT_POST_MEDIA: [MessageHandler(filters.PHOTO | filters.VIDEO, receive_post_media_handler)],
-            AWAIT_POST_CAPTION: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_post_caption_handler)],
-            CONFIRM_POST: [CallbackQueryHandler(post_confirmation_callback, pattern='^post_confirm$|^post_cancel$')]
+            # Sending the preview may wait on _POST_SEND_SEMAPHORE, which must not stall other updates
+            AWAIT_POST_CAPTION: [MessageHandler(filters.TEXT & ~filters.COMMAND, receive_post_caption_handler, block=False)],
+            # The group send can be slow, so don't hold up other updates while it runs
+            CONFIRM_POST: [CallbackQueryHandler(post_confirmation_callback, pattern=_POST_CONFIRM_RE, block=False)]
         },
         fallbacks=[CommandHandler('cancel', cancel_command)],
         per_message=False,
@@ -3041,7 +3807,7 @@ if __name__ == '__main__':
     purge_conv_handler = ConversationHandler(
         entry_points=[CommandHandler('purge', purge_command)],
         states={
-            CONFIRM_PURGE: [CallbackQueryHandler(purge_confirmation_callback, pattern='^purge_confirm$|^purge_cancel$')],
+            CONFIRM_PURGE: [CallbackQueryHandler(purge_confirmation_callback, pattern=_PURGE_CONFIRM_RE)],
             AWAIT_CONDITION_VERIFICATION: [], # User waits in this state for admin action
         },
         fallbacks=[CommandHandler('cancel', cancel_command)],
@@ -3053,11 +3819,11 @@ if __name__ == '__main__':
     random_conv_handler = ConversationHandler(
         entry_points=[CommandHandler('random', random_command)],
         states={
-            AWAIT_ADMIN_CHOICE: [CallbackQueryHandler(random_admin_choice_callback, pattern='^random_admin_')],
+            AWAIT_ADMIN_CHOICE: [CallbackQueryHandler(random_admin_choice_callback, pattern=_RANDOM_ADMIN_RE)],
             AWAIT_TARGET_USER: [MessageHandler(filters.TEXT | filters.FORWARDED, random_receive_target_user_handler)],
             AWAIT_RANDOM_MEDIA: [
                 MessageHandler(filters.PHOTO | filters.VIDEO | filters.VOICE, random_receive_media_handler),
-                CallbackQueryHandler(random_save_media_callback, pattern='^random_done_sending$')
+                CallbackQueryHandler(random_save_media_callback, pattern=_RANDOM_DONE_SENDING_RE)
             ],
         },
         fallbacks=[CommandHandler('cancel', cancel_command)],
@@ -3092,26 +3858,30 @@ if __name__ == '__main__':
     # add_command(app, 'post', post_command) # Now handled by ConversationHandler
     # add_command(app, 'purge', purge_command) # Now handled by ConversationHandler
 
-    app.add_handler(CallbackQueryHandler(help_menu_handler, pattern=r'^help_'))
-    app.add_handler(CallbackQueryHandler(post_risk_callback, pattern=r'^postrisk_'))
-    app.add_handler(CallbackQueryHandler(post_risk_with_taunt_callback, pattern=r'^posttaunt_'))
-    app.add_handler(CallbackQueryHandler(purge_risk_callback, pattern=r'^purgenow_'))
-    app.add_handler(CallbackQueryHandler(purge_risk_confirmation_callback, pattern=r'^purge(confirm|cancel)_'))
-    app.add_handler(CallbackQueryHandler(purge_verification_callback, pattern=r'^purge_verify_'))
+    app.add_handler(CallbackQueryHandler(help_menu_handler, pattern=_HELP_RE))
+    # The /seerisk buttons keep no conversation state, so a slow post or purge runs with
+    # block=False instead of holding up the updates queued behind it. The post and purge
+    # callbacks drop double-clicks themselves, since a second press no longer waits for the first.
+    app.add_handler(CallbackQueryHandler(post_risk_callback, pattern=_POSTRISK_RE, block=False))
+    app.add_handler(CallbackQueryHandler(post_risk_with_taunt_callback, pattern=_POSTTAUNT_RE, block=False))
+    app.add_handler(CallbackQueryHandler(purge_risk_callback, pattern=_PURGENOW_RE, block=False))
+    app.add_handler(CallbackQueryHandler(purge_risk_confirmation_callback, pattern=_PURGE_RISK_CONFIRM_RE, block=False))
+    app.add_handler(CallbackQueryHandler(purge_verification_callback, pattern=_PURGE_VERIFY_RE))
 
     # Fallback handler for dynamic hashtag commands.
     # The group=1 makes it lower priority than the static commands registered with add_command (which are in the default group 0)
     app.add_handler(MessageHandler(filters.TEXT & filters.Regex(r'^[./!].*'), dynamic_hashtag_command), group=1)
 
-    app.add_handler(MessageHandler((filters.TEXT | filters.CAPTION | filters.ATTACHMENT) & ~filters.COMMAND, hashtag_message_handler))
+    # The plain message handlers keep no conversation state, so they run with block=False and a
+    # slow Bot API call there does not hold up the updates queued behind it
+    app.add_handler(MessageHandler((filters.TEXT | filters.CAPTION | filters.ATTACHMENT) & ~filters.COMMAND, hashtag_message_handler, block=False))
     # Unified handler for edited messages: process hashtags, responses, and future logic
     async def edited_message_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        # Route edited messages through all main logic
-        await hashtag_message_handler(update, context)
-        await message_handler(update, context)
+        # Route edited messages through all main logic; the two are independent, so run them together
+        await asyncio.gather(hashtag_message_handler(update, context), message_handler(update, context))
         # Add future logic here as needed
-    app.add_handler(MessageHandler(filters.UpdateType.EDITED_MESSAGE, edited_message_handler))
-    app.add_handler(MessageHandler(filters.TEXT, message_handler))
+    app.add_handler(MessageHandler(filters.UpdateType.EDITED_MESSAGE, edited_message_handler, block=False))
+    app.add_handler(MessageHandler(filters.TEXT, message_handler, block=False))
 
     # Errors
     app.add_error_handler(error_handler)